@@ -53,9 +53,9 @@ from ...pandas import (
     get_obj,
 )
 from ...common import is_scalar
-from ...utils import as_series, get_grouper
+from ...broadcast import _grouper_compatible
+from ...utils import as_series, get_grouper, group_codes
 from ...factory import func_bootstrap, func_factory
-from ...tibble import Tibble
 
 is_character.register(Series, backend="pandas")(is_string_dtype)
 is_complex.register(Series, backend="pandas")(is_complex_dtype)
@@ -207,19 +207,48 @@ def _as_integer_sgb(x: SeriesGroupBy):
     return out
 
 
+def _is_element_grouped(x, y: SeriesGroupBy) -> Series:
+    """Check the elements of x in the values of each group of y
+
+    The (group, value) pairs of y are hashed, and the ones of x looked up
+    in them, so that all groups are checked at once.
+    If x is not grouped, all of it is checked in each group of y.
+    """
+    ygrouper = get_grouper(y)
+    if isinstance(x, SeriesGroupBy):
+        grouper = get_grouper(x)
+        if not _grouper_compatible(grouper, ygrouper, broadcastable=False):
+            raise ValueError("Grouping of x and y are not compatible")
+
+        ycodes = group_codes(y, grouper.result_index)
+        xcodes = grouper.codes_info
+        rows = np.flatnonzero(xcodes >= 0)
+        rows = rows[np.argsort(xcodes[rows], kind="stable")]
+        xcodes = xcodes[rows]
+        xvalues = get_obj(x).to_numpy()[rows]
+        index = grouper.result_index.take(xcodes)
+    else:
+        ycodes = ygrouper.codes_info
+        xvalues = np.atleast_1d(np.asarray(x))
+        xcodes = np.repeat(np.arange(ygrouper.ngroups), xvalues.size)
+        index = ygrouper.result_index.repeat(xvalues.size)
+        xvalues = np.tile(xvalues, ygrouper.ngroups)
+
+    yvalues = get_obj(y).to_numpy()
+    pairs = pd.MultiIndex.from_arrays([ycodes, yvalues])[ycodes >= 0]
+    out = pd.MultiIndex.from_arrays([xcodes, xvalues]).isin(pairs)
+    # NAs are not elements of anything, as np.isin does
+    return Series(out & ~pd.isnull(xvalues), index=index)
+
+
 @is_element.register(PandasObject, backend="pandas")
 def _is_element(x, y):
-    if isinstance(x, SeriesGroupBy) and isinstance(y, SeriesGroupBy):
-        df = Tibble.from_args(x=x, y=y)
-        return (
-            df._datar["grouped"]
-            .apply(lambda g: np.isin(g.x, g.y))
-            .explode()
-            .astype(bool)
-        )
+    if isinstance(y, SeriesGroupBy):
+        return _is_element_grouped(x, y)
 
     if isinstance(x, SeriesGroupBy):
-        out = x.transform(np.isin, test_elements=y).groupby(
+        obj = get_obj(x)
+        out = Series(np.isin(obj, y), index=obj.index).groupby(
             get_grouper(x),
             observed=x.observed,
             sort=x.sort,
@@ -229,9 +258,6 @@ def _is_element(x, y):
             out.is_rowwise = True
         return out
 
-    if isinstance(y, SeriesGroupBy):
-        return y.apply(lambda e: np.isin(x, e)).explode().astype(bool)
-
     if isinstance(x, Series):
         return x.isin(y)
 
@@ -1,5 +1,6 @@
 import numpy as np
 from datar_numpy.utils import make_array
+from datar.core.utils import logger
 from datar.apis.base import (  # noqa: F401
     append,
     c_,
@@ -18,20 +19,22 @@ from datar.apis.base import (  # noqa: F401
 from datar_numpy.api import seq as _  # noqa: F401
 
 from ... import pandas as pd
-from ...broadcast import _grouper_compatible
+from ...broadcast import _grouper_compatible, broadcast_to
 from ...collections import Collection
-from ...utils import get_grouper
+from ...utils import get_grouper, group_codes, split_offsets
 from ...common import is_integer, is_scalar
 from ...factory import func_bootstrap
 from ...pandas import (
     DataFrame,
+    Index,
+    MultiIndex,
     PandasObject,
     Series,
     SeriesGroupBy,
     NDFrame,
     get_obj,
 )
-from ...tibble import Tibble, TibbleGrouped, reconstruct_tibble
+from ...tibble import TibbleGrouped, reconstruct_tibble
 
 func_bootstrap(length, func=lambda x: x.shape[0], kind="agg")
 func_bootstrap(
@@ -48,68 +51,12 @@ func_bootstrap(
 
 @match.register(PandasObject, backend="pandas")
 def _match(x, table, nomatch=-1):
-    def match_dummy(xx, tab):
-        sorter = np.argsort(tab)
-        if isinstance(sorter, Series):
-            sorter = sorter.values
-        sorter_arr = np.asarray(sorter, dtype=np.intp)
-        searched = np.searchsorted(tab, xx, sorter=sorter_arr).ravel()
-        out = np.take(sorter_arr, searched, mode="clip")
-        out[~np.isin(xx, tab)] = nomatch
-        return out
-
     if isinstance(x, SeriesGroupBy):
-        # length of each group may differ
-        # table could be, for example, unique elements of each group in x
-        x1 = x.agg(tuple)
-        x1 = x1.groupby(
-            x1.index,
-            observed=x.observed,
-            sort=x.sort,
-            dropna=x.dropna,
-        )
-        xgrouper = get_grouper(x1)
-        df = get_obj(x1).to_frame()
-        if isinstance(table, SeriesGroupBy):
-            t1 = table.agg(tuple)
-            t1 = t1.groupby(
-                t1.index,
-                observed=table.observed,
-                sort=table.sort,
-                dropna=table.dropna,
-            )
-            if not _grouper_compatible(xgrouper, get_grouper(t1)):
-                raise ValueError("Grouping of x and table are not compatible")
-            df["table"] = get_obj(t1)
-        elif isinstance(table, Series):
-            t1 = table.groupby(
-                table.index,
-                observed=True,
-                sort=False,
-                dropna=False,
-            ).agg(tuple)
-            t1 = t1.groupby(
-                t1.index,
-                observed=x1.observed,
-                sort=x1.sort,
-                dropna=x1.dropna,
-            )
-            if not _grouper_compatible(xgrouper, get_grouper(t1)):
-                df["table"] = [make_array(table)] * df.shape[0]
-            else:
-                df["table"] = get_obj(t1)
-        else:
-            df["table"] = [make_array(table)] * df.shape[0]
-
-        out = (
-            df
-            # not working for pandas 1.3.0
-            # .agg(lambda row: match_dummy(*row), axis=1)
-            .apply(lambda row: match_dummy(*row), axis=1)
-            .explode()
-            .astype(int)
+        out = Series(
+            _match_grouped(x, table, nomatch),
+            index=get_obj(x).index,
         ).groupby(
-            xgrouper,
+            get_grouper(x),
             observed=x.observed,
             sort=x.sort,
             dropna=x.dropna,
@@ -118,10 +65,63 @@ def _match(x, table, nomatch=-1):
             out.is_rowwise = True
         return out
 
+    if isinstance(table, SeriesGroupBy):
+        table = get_obj(table)
+
     if isinstance(x, Series):
-        return Series(match_dummy(x, table), index=x.index)
+        return Series(_match_values(x, table, nomatch), index=x.index)
 
-    return match_dummy(x, table)
+    return _match_values(x, table, nomatch)
+
+
+def _match_values(x, table, nomatch: int) -> np.ndarray:
+    """Find the positions of the first matches of x in table by hashing"""
+    table = Index(make_array(table))
+    first = ~table.duplicated()
+    idx = table[first].get_indexer(make_array(x))
+    matched = (idx >= 0) & ~np.asarray(pd.isnull(x))
+    out = np.full(idx.size, nomatch, dtype=int)
+    out[matched] = np.flatnonzero(first)[idx[matched]]
+    return out
+
+
+def _match_grouped(x: SeriesGroupBy, table, nomatch: int) -> np.ndarray:
+    """Match x in the table of the same group
+
+    The (group, value) pairs of the table are hashed together, so that all
+    groups are matched at once. The positions are the ones in the groups.
+    """
+    grouper = get_grouper(x)
+    result_index = grouper.result_index
+    if isinstance(table, SeriesGroupBy):
+        tgrouper = get_grouper(table)
+        if not _grouper_compatible(grouper, tgrouper, broadcastable=False):
+            raise ValueError("Grouping of x and table are not compatible")
+        tcodes = group_codes(table, result_index)
+        table = get_obj(table)
+    elif (
+        isinstance(table, Series)
+        and list(table.index.names) == list(grouper.names)
+        and result_index.symmetric_difference(table.index.unique()).empty
+    ):
+        # i.e. unique(gf.y), with the group keys as index
+        tcodes = result_index.get_indexer(table.index)
+    else:
+        return _match_values(get_obj(x), table, nomatch)
+
+    tpos = Series(tcodes).groupby(tcodes).cumcount().to_numpy()
+    pairs = DataFrame({"code": tcodes, "value": table.to_numpy(), "pos": tpos})
+    pairs = pairs[pairs["code"] >= 0].drop_duplicates(["code", "value"])
+
+    xcodes = grouper.codes_info
+    xvalues = get_obj(x)
+    idx = MultiIndex.from_arrays([pairs["code"], pairs["value"]]).get_indexer(
+        MultiIndex.from_arrays([xcodes, xvalues.to_numpy()])
+    )
+    matched = (idx >= 0) & (xcodes >= 0) & xvalues.notna().to_numpy()
+    out = np.full(idx.size, nomatch, dtype=int)
+    out[matched] = pairs["pos"].to_numpy()[idx[matched]]
+    return out
 
 
 def _order_post(out, x, decreasing=False, na_last=True):
@@ -155,39 +155,99 @@ def _order(x: Series, decreasing=False, na_last=True):
 
 @rep.register(SeriesGroupBy, backend="pandas")
 def _rep_sgb(x, times=1, length=None, each=1):
-    data = {}
-    times_sgb = isinstance(times, SeriesGroupBy)
-    length_sgb = isinstance(length, SeriesGroupBy)
-    each_sgb = isinstance(each, SeriesGroupBy)
-    if times_sgb:
-        data["times"] = times
-    if length_sgb:
-        data["length"] = length
-    if each_sgb:
-        data["each"] = each
-    # in case x is not grouped
-    data["x"] = x
-
-    df = Tibble.from_args(**data)
-    out = (
-        df._datar["grouped"]
-        .apply(
-            lambda subdf: rep.dispatch(object, backend="numpy")(
-                subdf["x"],
-                times=subdf["times"] if times_sgb else times,
-                length=subdf["length"] if length_sgb else length,
-                each=subdf["each"] if each_sgb else each,
-            )
+    if not isinstance(x, SeriesGroupBy):
+        # in case x is not grouped
+        grouped = next(
+            arg
+            for arg in (times, length, each)
+            if isinstance(arg, SeriesGroupBy)
         )
-        .explode()
-        .astype(df["x"].obj.dtype)
+        index = get_obj(grouped).index
+        x = broadcast_to(x, index, get_grouper(grouped))
+        x = Series(x, index=index) if is_scalar(x) else x
+        x = x.groupby(
+            get_grouper(grouped),
+            observed=grouped.observed,
+            sort=grouped.sort,
+            dropna=grouped.dropna,
+        )
+
+    grouper = get_grouper(x)
+    obj = get_obj(x)
+    order, offsets = split_offsets(grouper.codes_info, grouper.ngroups)
+    sizes = np.diff(offsets)
+    gids = np.repeat(np.arange(grouper.ngroups), sizes)
+
+    def group_values(arg):
+        """The values of the rows, sorted by groups"""
+        if isinstance(arg, SeriesGroupBy):
+            arg = broadcast_to(arg, obj.index, grouper).to_numpy()
+            return arg[order]
+        return arg
+
+    if not isinstance(times, SeriesGroupBy) and not is_scalar(times):
+        times = make_array(times)
+        if times.size == 1:
+            times = times[0]
+        else:
+            # the times of the elements in each group
+            bad_sizes = sizes[(sizes > 0) & (sizes != times.size)]
+            if bad_sizes.size > 0:
+                raise ValueError(
+                    "Invalid times argument, expect length "
+                    f"{bad_sizes[0]}, got {times.size}"
+                )
+            times = times[np.arange(gids.size) - offsets[gids]]
+
+    times = group_values(times)
+    length = group_values(length)
+    each = group_values(each)
+
+    # times of the elements can't be combined with each
+    if isinstance(times, np.ndarray) and np.any(each != 1):
+        raise ValueError("Unexpected each argument when times is an iterable.")
+
+    # rows repeated in each group, and then tiled `times_g` times
+    if isinstance(times, np.ndarray):
+        repeats, times_g = times, np.ones(grouper.ngroups, dtype=int)
+    else:
+        repeats, times_g = each, np.full(grouper.ngroups, times, dtype=int)
+
+    rows = np.repeat(order, repeats)
+    sizes_a = np.bincount(
+        np.repeat(gids, repeats),
+        minlength=grouper.ngroups,
     )
-    grouping = out.index
-    return out.reset_index(drop=True).groupby(
-        grouping,
-        observed=df._datar["grouped"].observed,
-        sort=df._datar["grouped"].sort,
-        dropna=df._datar["grouped"].dropna,
+    if length is None:
+        sizes_b = sizes_a * times_g
+    elif isinstance(length, np.ndarray):
+        # the first element of each group
+        if (sizes > 1).any():
+            logger.warning(
+                "In rep(...): first element used of 'length' argument"
+            )
+        sizes_b = np.zeros(grouper.ngroups, dtype=int)
+        sizes_b[sizes > 0] = length[offsets[:-1][sizes > 0]]
+    else:
+        sizes_b = np.full(grouper.ngroups, length, dtype=int)
+    sizes_b[sizes_a == 0] = 0
+
+    # cycle through the rows of each group
+    out_gids = np.repeat(np.arange(grouper.ngroups), sizes_b)
+    starts_a = np.cumsum(sizes_a) - sizes_a
+    starts_b = np.cumsum(sizes_b) - sizes_b
+    pos = np.arange(out_gids.size) - starts_b[out_gids]
+    rows = rows[starts_a[out_gids] + pos % sizes_a[out_gids]]
+
+    return (
+        obj.take(rows)
+        .reset_index(drop=True)
+        .groupby(
+            grouper.result_index.take(out_gids),
+            observed=x.observed,
+            sort=x.sort,
+            dropna=x.dropna,
+        )
     )
 
 
@@ -211,31 +271,33 @@ def _rep_grouped(x, times=1, length=None, each=1):
 
 @c_.register(SeriesGroupBy, backend="pandas")
 def _c_sgb(*args):
+    grouper = get_grouper(
+        next(arg for arg in args if isinstance(arg, SeriesGroupBy))
+    )
+    result_index = grouper.result_index
+    ngroups = grouper.ngroups
+
+    # the values of the pieces, with their groups
     values = []
+    gids = []
     for elem in args:
         if isinstance(elem, SeriesGroupBy):
-            values.append(elem.agg(list))
-        elif is_scalar(elem):
-            values.append(elem)
-        else:
-            values.extend(elem)
-
-    df = Tibble.from_args(*values)
-    # pandas 1.3.0 expand list into columns after aggregation
-    # pandas 1.3.2 has this fixed
-    # https://github.com/pandas-dev/pandas/issues/42727
-    out = df.agg(
-        lambda row: Collection(*row),
-        axis=1,
-    )
-    if isinstance(out, DataFrame):  # pragma: no cover
-        # pandas < 1.3.2
-        out = Series(out.values.tolist(), index=out.index, dtype=object)
+            values.append(get_obj(elem).reset_index(drop=True))
+            gids.append(group_codes(elem, result_index))
+            continue
+
+        for value in [elem] if is_scalar(elem) else elem:
+            values.append(Series([value] * ngroups))
+            gids.append(np.arange(ngroups))
 
-    out = out.explode().convert_dtypes()
+    pieces = np.repeat(np.arange(len(values)), [len(value) for value in values])
+    gids = np.concatenate(gids)
+    order = np.lexsort((pieces, gids))
+    order = order[gids[order] >= 0]
+
+    out = pd.concat(values, ignore_index=True).take(order).reset_index(drop=True)
     # TODO: check observed, sort and dropna?
-    out = out.reset_index(drop=True).groupby(out.index)
-    return out
+    return out.convert_dtypes().groupby(result_index.take(gids[order]))
 
 
 # Define different function so that it has higher priority
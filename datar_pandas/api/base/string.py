@@ -21,7 +21,8 @@ from datar.apis.base import (
 )
 from datar_numpy.api import string as _  # noqa: F401
 
-from ...utils import get_grouper
+from ...pandas import Series
+from ...utils import as_strs, get_grouper
 from ...factory import func_bootstrap
 from ...tibble import Tibble, TibbleGrouped, TibbleRowwise
 
@@ -101,10 +102,15 @@ func_bootstrap(
 
 
 def _paste(frame, sep, collapse):
-    out = frame.apply(
-        lambda col: col.astype(str).str.cat(sep=sep),
-        axis=1,
-    )
+    # paste column by column, skipping the NAs
+    out = None
+    for i in range(frame.shape[1]):
+        strs = as_strs(frame.iloc[:, i], keep_na=True)
+        if out is None:
+            out = strs
+        else:
+            out = out.str.cat(strs, sep=sep).fillna(out).fillna(strs)
+    out = out.fillna("").astype(str)
     if isinstance(frame, TibbleGrouped):
         grouped = frame._datar["grouped"]
         out = out.groupby(
@@ -118,7 +124,7 @@ def _paste(frame, sep, collapse):
             return out
         if collapse is None:
             return out
-        return out.apply(lambda x: collapse.join(x))
+        return out.agg(collapse.join)
     return collapse.join(out) if collapse else out
 
 
@@ -148,9 +154,11 @@ func_bootstrap(sprintf, func=sprintf)
 @sprintf.apply_df.register(Tibble)
 @sprintf.apply_df.register(TibbleGrouped)
 def _sprintf_apply_df(data, bound, exclude, func):
-    out = data.apply(
-        lambda col: col.values[0] % tuple(col.values[1:]),
-        axis=1,
+    # format the rows from the columns, without a Series for each row
+    columns = [data.iloc[:, i].tolist() for i in range(data.shape[1])]
+    out = Series(
+        [fmt % tuple(values) for fmt, *values in zip(*columns)],
+        index=data.index,
     )
     if isinstance(data, TibbleGrouped):
         grouped = data._datar["grouped"]
@@ -1,5 +1,6 @@
 """Function from R-base that can be used as verbs"""
 
+import warnings
 from typing import Sequence, cast
 
 import numpy as np
@@ -22,8 +23,16 @@ from datar.apis.base import (
     tail,
 )
 
-from ...pandas import DataFrame, Series, Index, SeriesGroupBy, get_obj
+from ...pandas import (
+    DataFrame,
+    Series,
+    Index,
+    SeriesGroupBy,
+    get_obj,
+    is_numeric_dtype,
+)
 from ...common import is_scalar, unique as _unique
+from ...utils import get_grouper
 
 
 @colnames.register(DataFrame, backend="pandas")
@@ -154,7 +163,17 @@ def _t(_data, copy=False):
 
 @unique.register(SeriesGroupBy, backend="pandas")
 def _unique_sgb(x):
-    return x.apply(_unique).explode().astype(get_obj(x).dtype)
+    grouper = get_grouper(x)
+    obj = get_obj(x)
+    codes = grouper.codes_info
+    # the first row of each (group, value) pair, with the groups in order
+    dups = DataFrame({"code": codes, "value": obj.reset_index(drop=True)})
+    rows = np.flatnonzero(~dups.duplicated().to_numpy() & (codes >= 0))
+    rows = rows[np.argsort(codes[rows], kind="stable")]
+
+    out = obj.take(rows)
+    out.index = grouper.result_index.take(codes[rows])
+    return out
 
 
 @duplicated.register(DataFrame, backend="pandas")
@@ -171,21 +190,50 @@ def _duplicated(
 def _max_col(df, ties_method="random"):
     ties_method = arg_match(ties_method, "ties_method", ["random", "first", "last"])
 
-    def which_max_with_ties(ser: Series):
-        """Find index with max if ties happen"""
-        indices = np.flatnonzero(ser == max(ser))
-        if len(indices) == 1 or ties_method == "first":
-            return indices[0]
-        if ties_method == "random":
-            return np.random.choice(indices)
-        return indices[-1]
+    if not all(is_numeric_dtype(dtype) for dtype in df.dtypes):
+
+        def which_max_with_ties(ser: Series):
+            """Find index with max if ties happen"""
+            indices = np.flatnonzero(ser == max(ser))
+            if len(indices) == 1 or ties_method == "first":
+                return indices[0]
+            if ties_method == "random":
+                return np.random.choice(indices)
+            return indices[-1]
+
+        return df.apply(which_max_with_ties, axis=1).values
+
+    # Take the maximums of the rows in chunks, so that a frame with mixed
+    # dtypes is not turned into one big float array.
+    # NAs are ignored unless all the values of a row are NAs, which get NA
+    out = np.empty(df.shape[0], dtype=float)
+    chunk = max(1, (1 << 20) // max(df.shape[1], 1))
+    for start in range(0, df.shape[0], chunk):
+        values = df.iloc[start : start + chunk].to_numpy(
+            dtype=float,
+            na_value=np.nan,
+        )
+        with warnings.catch_warnings():
+            # All-NaN slice encountered
+            warnings.simplefilter("ignore", RuntimeWarning)
+            ties = values == np.nanmax(values, axis=1, keepdims=True)
+
+        if ties_method == "first":
+            idx = ties.argmax(axis=1)
+        elif ties_method == "last":
+            idx = values.shape[1] - 1 - ties[:, ::-1].argmax(axis=1)
+        else:
+            # the tie with the largest random key
+            idx = np.where(ties, np.random.random(values.shape), -1.0).argmax(axis=1)
+
+        out[start : start + chunk] = np.where(ties.any(axis=1), idx, np.nan)
 
-    return df.apply(which_max_with_ties, axis=1).values
+    return out if np.isnan(out).any() else out.astype(np.intp)
 
 
 @complete_cases.register(DataFrame, backend="pandas")
 def _complete_cases(_data):
-    return _data.apply(lambda row: row.notna().all(), axis=1).values
+    return _data.notna().all(axis=1).values
 
 
 # actually from R::utils
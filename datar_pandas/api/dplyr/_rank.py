@@ -63,7 +63,7 @@ def _row_number(x):
 
 @_row_number.register(SeriesGroupBy)
 def _(x):
-    out = x.transform(_row_number)
+    out = _rank(x, na_last="keep", method="first")
     return out.groupby(
         get_grouper(x),
         observed=x.observed,
@@ -162,7 +162,11 @@ def _ntile_ndarray(x, n):
 
 @_ntile.register(GroupBy)
 def _ntile_groupby(x, n):
-    return x.transform(lambda grup: _ntile_array_values(grup.values, n))
+    # the ranks and the non-NA counts of the groups, for all groups at once
+    ranked = x.rank(method="min", na_option="keep")
+    counts = x.transform("count")
+    out = np.floor((ranked - 1) * np.minimum(n, counts) / counts) + 1
+    return out.astype(float)
 
 
 @singledispatch
@@ -195,9 +199,7 @@ def _(x, na_last="keep"):
     )
     maxs = ranking.transform("max")
     mins = ranking.transform("min")
-    ret = ranking.transform(lambda r: (r - mins) / (maxs - mins))
-    ret[get_obj(ranking).isna()] = np.nan
-    return ret
+    return (get_obj(ranking) - mins) / (maxs - mins)
 
 
 @singledispatch
@@ -223,4 +225,12 @@ def _(x, na_last="keep"):
 
 @_cume_dist.register(GroupBy)
 def _(x, na_last="keep"):
-    return x.transform(_cume_dist.dispatch(Series), na_last=na_last)
+    # the number of values less than or equal to each value is its max rank
+    ranking = cast(Series, _rank(x, na_last, "max"))
+    totals = ranking.notna().groupby(
+        get_grouper(x),
+        observed=x.observed,
+        sort=x.sort,
+        dropna=x.dropna,
+    ).transform("sum")
+    return ranking / totals
@@ -19,11 +19,11 @@ from datar.apis.dplyr import (
 from datar_numpy.utils import make_array
 
 from ... import pandas as pd
-from ...pandas import DataFrame, Series, SeriesGroupBy
-from ...utils import as_series
+from ...pandas import DataFrame, Series, SeriesGroupBy, get_obj
+from ...utils import as_series, get_grouper, split_offsets
 from ...common import is_scalar
 from ...factory import func_bootstrap
-from ...tibble import Tibble
+from ...tibble import Tibble, TibbleGrouped
 
 
 @between.register(object, backend="pandas")
@@ -151,7 +151,7 @@ def _nth_(x, n, order_by=np.nan, default=np.nan, *, __args_raw=None):
     order_by_null = np.asarray(order_by_null, dtype=bool)
 
     if not order_by_null.all():
-        x = x.iloc[as_series(order_by).argsort().values]
+        x = x.iloc[as_series(order_by).argsort(kind="stable").values]
 
     try:
         return x.iloc[n]
@@ -239,6 +239,63 @@ def _last(
     )
 
 
+def _nth_grouped(data, bound, n):
+    """Get the nth element of x in all groups at once
+
+    The rows are put together by the groups (and ordered by `order_by`
+    within them) with one stable sort, then taken at the starts of the groups
+    plus `n` (or the ends minus `-n`).
+    """
+    if not isinstance(n, int):
+        raise TypeError("`nth` expects `n` to be an integer")
+
+    grouper = get_grouper(data._datar["grouped"])
+    codes = grouper.codes_info
+    x = get_obj(data["x"]).reset_index(drop=True)
+
+    order_by_null = np.asarray(
+        pd.isnull(bound.arguments["__args_raw"]["order_by"]),
+        dtype=bool,
+    )
+    if order_by_null.all():
+        order, offsets = split_offsets(codes, grouper.ngroups)
+    else:
+        order_by = get_obj(data["order_by"]).reset_index(drop=True)
+        rows = order_by.sort_values(
+            kind="stable",
+            na_position="last",
+        ).index.to_numpy()
+        order, offsets = split_offsets(codes[rows], grouper.ngroups)
+        order = rows[order]
+
+    sizes = np.diff(offsets)
+    at = n if n >= 0 else sizes + n
+    valid = (at >= 0) & (at < sizes)
+    out = (
+        x.take(order[(offsets[:-1] + at)[valid]])
+        .set_axis(np.flatnonzero(valid))
+        .rename(None)
+        .reindex(range(grouper.ngroups), fill_value=bound.arguments["default"])
+    )
+    out.index = grouper.result_index
+    return out
+
+
+@nth.apply_df.register(TibbleGrouped)
+def _nth_apply_df_grouped(data, bound, exclude, func):
+    return _nth_grouped(data, bound, bound.arguments["n"])
+
+
+@first.apply_df.register(TibbleGrouped)
+def _first_apply_df_grouped(data, bound, exclude, func):
+    return _nth_grouped(data, bound, 0)
+
+
+@last.apply_df.register(TibbleGrouped)
+def _last_apply_df_grouped(data, bound, exclude, func):
+    return _nth_grouped(data, bound, -1)
+
+
 @consecutive_id.register(object, backend="pandas")
 def _consecutive_id_obj(x, *args):
     df = Tibble.from_args(x, *args)
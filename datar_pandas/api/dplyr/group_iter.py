@@ -10,11 +10,11 @@ from __future__ import annotations
 import inspect
 from typing import Any, Callable, Optional, cast
 
+import numpy as np
 from pipda import register_verb
 from datar.core.utils import logger
 from datar.apis.dplyr import (
     group_keys,
-    group_rows,
     group_vars,
     group_by,
     ungroup,
@@ -34,6 +34,7 @@ from ...pandas import DataFrame
 from ...contexts import Context
 from ...tibble import TibbleGrouped, TibbleRowwise, reconstruct_tibble
 from ...common import setdiff, intersect
+from ...utils import get_grouper, split_offsets
 from ..base.asis import is_factor
 from ..base.factor import droplevels
 
@@ -325,12 +326,6 @@ def group_split_impl(data, _keep):
         __ast_fallback="normal",  # type: ignore
         __backend="pandas",  # type: ignore
     )
-    indices = group_rows(
-        data,
-        __ast_fallback="normal",  # type: ignore
-        __backend="pandas",  # type: ignore
-    )
-
     if not _keep:
         remove = group_vars(
             data,
@@ -341,5 +336,14 @@ def group_split_impl(data, _keep):
         _keep = setdiff(_keep, remove)
         out = out[_keep]
 
-    for rows in indices:
-        yield out.iloc[rows, :].reset_index(drop=True)
+    if isinstance(data, TibbleGrouped):
+        grouper = get_grouper(data._datar["grouped"])
+        codes, ngroups = grouper.codes_info, grouper.ngroups
+    else:
+        codes, ngroups = np.zeros(out.shape[0], dtype=np.intp), 1
+
+    # take the rows once, each group is then a slice of it
+    order, offsets = split_offsets(codes, ngroups)
+    out = out.take(order)
+    for i in range(ngroups):
+        yield out.iloc[offsets[i] : offsets[i + 1], :].reset_index(drop=True)
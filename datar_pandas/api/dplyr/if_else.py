@@ -9,8 +9,15 @@ from datar.apis.dplyr import if_else, case_when, case_match
 
 from ... import pandas as pd
 from ...utils import meta_kwargs, get_grouper
-from ...pandas import Series, SeriesGroupBy, get_obj
-from ...tibble import Tibble, reconstruct_tibble
+from ...common import is_scalar
+from ...pandas import (
+    Categorical,
+    CategoricalDtype,
+    Series,
+    SeriesGroupBy,
+    get_obj,
+)
+from ...tibble import Tibble, TibbleGrouped
 from ..dplyr.group_by import ungroup
 
 
@@ -79,6 +86,106 @@ def _if_else_sgb(condition, true, false, missing=None):
     )
 
 
+def _case_when_columns(when_cases):
+    """Broadcast the conditions and values to columns of the same length
+
+    The index (and the grouping) are taken from the Series (SeriesGroupBy)
+    ones, which should have the same index (and the same grouper).
+    Otherwise, None is returned, and they need to be aligned by
+    `Tibble.from_args()`.
+    """
+    index = grouped = None
+    lengths = set()
+    for wc in when_cases:
+        if isinstance(wc, SeriesGroupBy):
+            if grouped is None:
+                grouped = wc
+            elif get_grouper(wc) is not get_grouper(grouped):
+                return None
+            wc = get_obj(wc)
+
+        if isinstance(wc, Series):
+            if index is None:
+                index = wc.index
+            elif not wc.index.equals(index):
+                return None
+
+        if not is_scalar(wc):
+            lengths.add(len(wc))
+
+    if index is not None:
+        n = index.size
+    elif lengths - {1}:
+        n = max(lengths - {1})
+    else:
+        n = 1
+    if 0 in lengths or lengths - {1, n}:
+        return None
+
+    columns = []
+    for wc in when_cases:
+        if isinstance(wc, SeriesGroupBy):
+            wc = get_obj(wc)
+        if isinstance(wc, Series):
+            wc = wc.reset_index(drop=True)
+        elif is_scalar(wc):
+            wc = Series(wc, index=range(n))
+        else:
+            wc = Series(wc)
+            if n > 1 and wc.size == 1:
+                wc = wc.repeat(n).reset_index(drop=True)
+        columns.append(wc)
+
+    return columns, index, grouped
+
+
+def _case_when_select(conditions, values):
+    """Select the values by the first matched conditions, with the dtype
+    planned from the values so that they are not put into objects unless
+    they have to.
+    """
+    matched_all = np.logical_or.reduce(conditions).all()
+    dtypes = [value.dtype for value in values]
+
+    if all(isinstance(dtype, CategoricalDtype) for dtype in dtypes) and all(
+        dtype == dtypes[0] for dtype in dtypes
+    ):
+        codes = np.select(
+            conditions,
+            [value.cat.codes.to_numpy() for value in values],
+            default=-1,
+        )
+        return Series(Categorical.from_codes(codes, dtype=dtypes[0]))
+
+    numeric = all(
+        isinstance(dtype, np.dtype) and dtype.kind in "iuf" for dtype in dtypes
+    )
+    logical = all(
+        isinstance(dtype, np.dtype) and dtype.kind == "b" for dtype in dtypes
+    )
+    if numeric or (logical and matched_all):
+        dtype = np.result_type(*dtypes)
+        if not matched_all:
+            # unmatched rows get NAs
+            dtype = np.result_type(dtype, np.float64)
+        return Series(
+            np.select(
+                conditions,
+                [value.to_numpy(dtype=dtype) for value in values],
+                default=np.nan if not matched_all else dtype.type(0),
+            )
+        )
+
+    return Series(
+        np.select(
+            conditions,
+            [value.to_numpy(dtype=object) for value in values],
+            default=np.nan,
+        ),
+        dtype=object,
+    ).infer_objects()
+
+
 @case_when.register(object, backend="pandas")
 def _case_when(when, case, *when_cases):
     if len(when_cases) % 2 != 0:
@@ -87,20 +194,42 @@ def _case_when(when, case, *when_cases):
     when_cases = (when, case, *when_cases)
 
     is_series = any(isinstance(wc, (Series, SeriesGroupBy)) for wc in when_cases)
-    df = Tibble.from_args(*when_cases, _name_repair="minimal")
-    ungrouped = ungroup(df, **meta_kwargs)
+    columns = _case_when_columns(when_cases)
+    if columns is None:
+        df = Tibble.from_args(*when_cases, _name_repair="minimal")
+        ungrouped = ungroup(df, **meta_kwargs)
+        columns = [
+            ungrouped.iloc[:, i].reset_index(drop=True)
+            for i in range(ungrouped.shape[1])
+        ]
+        index = ungrouped.index
+        grouped = df._datar["grouped"] if isinstance(df, TibbleGrouped) else None
+    else:
+        columns, index, grouped = columns
 
-    value = Series(np.nan, index=ungrouped.index, dtype=object)
-    for i in range(ungrouped.shape[1] - 1, 0, -2):
-        raw_condition = ungrouped.iloc[:, i - 1].values
+    conditions = []
+    for column in columns[::2]:
+        raw_condition = column.to_numpy()
         condition = np.where(pd.isnull(raw_condition), False, raw_condition)
-        condition = condition.astype(bool)
-        value[condition] = ungrouped.iloc[:, i][condition]
-    value = value.infer_objects()
+        conditions.append(condition.astype(bool))
+
+    value = _case_when_select(conditions, columns[1::2])
+    value.name = "when_case_result"
+    if index is not None:
+        value.index = index
+
+    if grouped is not None:
+        is_rowwise = getattr(grouped, "is_rowwise", False)
+        value = value.groupby(
+            get_grouper(grouped),
+            observed=grouped.observed,
+            sort=grouped.sort,
+            dropna=grouped.dropna,
+        )
+        if is_rowwise:
+            value.is_rowwise = True
+        return value
 
-    value = value.to_frame(name="when_case_result")
-    value = reconstruct_tibble(value, df)
-    value = value["when_case_result"]
     return value if is_series else value.values
 
 
@@ -109,22 +238,36 @@ def _case_match(_x, *args, _default=None, _dtypes=None):
     if len(args) % 2 != 0 or len(args) == 0:
         raise ValueError("condition-value not paired.")
 
-    x = ungroup(_x, **meta_kwargs) if isinstance(_x, SeriesGroupBy) else _x
-    cases = (
-        arg if i % 2 == 1 else np.isin(x, arg).astype(bool) | pd.isnull(x)
-        for i, arg in enumerate(args)
-    )
-    cases = (*cases, True, [None] if _default is None else _default)
+    x = get_obj(_x) if isinstance(_x, SeriesGroupBy) else _x
+    x_isnull = pd.isnull(x)
+    cases = []
+    for i, arg in enumerate(args):
+        if i % 2 == 1:
+            cases.append(arg)
+            continue
+
+        # NAs only match NAs
+        case = np.isin(x, arg) | (x_isnull & np.any(pd.isnull(arg)))
+        if isinstance(x, Series):
+            case = Series(case, index=x.index)
+        cases.append(case)
+
+    if _default is not None:
+        cases.extend((True, _default))
+
     out = case_when(*cases, **meta_kwargs)
+    grouped = out if isinstance(out, SeriesGroupBy) else _x
+    if isinstance(out, SeriesGroupBy):
+        out = get_obj(out)
     if _dtypes is not None:
         out = out.astype(_dtypes)
 
-    if not isinstance(_x, SeriesGroupBy):
+    if not isinstance(grouped, SeriesGroupBy):
         return out
 
     return out.groupby(
-        get_grouper(_x),
-        observed=_x.observed,
-        sort=_x.sort,
-        dropna=_x.dropna,
+        get_grouper(grouped),
+        observed=grouped.observed,
+        sort=grouped.sort,
+        dropna=grouped.dropna,
     )
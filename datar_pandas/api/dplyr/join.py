@@ -3,6 +3,8 @@ from __future__ import annotations
 
 from typing import Any, Dict, Optional, cast
 
+import numpy as np
+from pipda import register_verb
 from datar.apis.dplyr import (
     filter_,
     ungroup,
@@ -19,7 +21,7 @@ from datar.apis.dplyr import (
 from ... import pandas as pd
 from ...utils import meta_kwargs
 from ...typing import Data, Str
-from ...pandas import Categorical, DataFrame, SeriesGroupBy, get_obj
+from ...pandas import Categorical, DataFrame, union_categoricals
 from ...common import is_factor, is_scalar, intersect, setdiff, union
 from ...contexts import Context
 from ...tibble import reconstruct_tibble
@@ -80,23 +82,22 @@ def _join(
             by = intersect(newx.columns, y.columns)
 
         by = [by] if is_scalar(by) else list(by)
-        ret = pd.merge(newx, y, on=by, how=how, suffixes=suffix)
-        for col in by:
-            # try recovering factor columns
-            xcol = x[col]
-            ycol = y[col]
-            if isinstance(xcol, SeriesGroupBy):
-                xcol = get_obj(xcol)
-            if isinstance(ycol, SeriesGroupBy):  # pragma: no cover
-                ycol = get_obj(ycol)
-            if is_factor(xcol) and is_factor(ycol):
-                ret[col] = Categorical(
-                    ret[col],
-                    categories=union(
-                        xcol.cat.categories,
-                        ycol.cat.categories,
-                    ),
-                )
+        # join factors on the shared integer codes
+        newx, y, categories = _factor_codes(newx, y, by)
+        if _sorted_on(newx, y, by):
+            ret = _merge_sorted(newx, y, by, how=how, suffix=suffix)
+        else:
+            ret = pd.merge(newx, y, on=by, how=how, suffixes=suffix)
+        for col, (cats, decode) in categories.items():
+            if decode is False:
+                # try recovering factor columns
+                ret[col] = Categorical(ret[col], categories=cats)
+                continue
+
+            codes = ret[col].to_numpy()
+            if decode is not None:
+                codes = decode[codes]
+            ret[col] = Categorical.from_codes(codes, categories=cats)
 
     return reconstruct_tibble(ret, x)
 
@@ -335,6 +336,114 @@ def _cross_join(
     return x.merge(y, how="cross", suffixes=suffix, copy=copy)
 
 
+def _factor_codes(x, y, by):
+    """Replace the `by` columns that are factors on both sides with the
+    integer codes of the unified categories.
+
+    To keep the order of full joins, the codes follow the order of the
+    categories when both sides share the same categories, and the order of
+    the values otherwise (where missing values go last), as pandas does for
+    the categorical keys.
+
+    Returns:
+        The new x, y and a dict of the `by` columns to the categories and
+        the array to turn the keys back to the codes (None if they are
+        the codes already, False if the join is done on the values)
+    """
+    keys = {}
+    categories: Dict[Any, Any] = {}
+    for col in by:
+        xcol = x[col]
+        ycol = y[col]
+        if not is_factor(xcol) or not is_factor(ycol):
+            continue
+
+        try:
+            unified = union_categoricals(
+                [xcol.values, ycol.values],
+                ignore_order=True,
+            )
+            order = unified.categories.argsort()
+        except TypeError:
+            # not unifiable or sortable, join on the values
+            unified = None
+
+        if unified is None:
+            categories[col] = (
+                union(xcol.cat.categories, ycol.cat.categories),
+                False,
+            )
+            continue
+
+        if xcol.dtype == ycol.dtype:
+            # missing values (code -1) go first
+            keys[col] = unified.codes
+            categories[col] = (unified.categories, None)
+            continue
+
+        # missing values go last
+        rank = np.empty(order.size + 1, dtype=order.dtype)
+        rank[order] = np.arange(order.size)
+        rank[-1] = order.size
+        keys[col] = rank[unified.codes]
+        categories[col] = (unified.categories, np.append(order, -1))
+
+    if not keys:
+        return x, y, categories
+
+    nx = x.shape[0]
+    x = x.copy(deep=False)
+    y = y.copy(deep=False)
+    for col, key in keys.items():
+        x[col] = key[:nx]
+        y[col] = key[nx:]
+
+    return x, y, categories
+
+
+def _sorted_on(x, y, by):
+    """Check if x and y are both sorted on a single key, so that the join
+    can be done by walking both keys at once instead of hashing them.
+
+    pandas uses the merge-join (`libjoin`) path for monotonic indexes, as
+    long as one of the sides has unique keys.
+    """
+    if len(by) != 1 or x.shape[0] == 0 or y.shape[0] == 0:
+        return False
+
+    xkey = x[by[0]]
+    ykey = y[by[0]]
+    if (
+        xkey.dtype != ykey.dtype
+        or is_factor(xkey)
+        or xkey.dtype == object
+        or not xkey.is_monotonic_increasing
+        or not ykey.is_monotonic_increasing
+    ):
+        return False
+
+    return xkey.is_unique or ykey.is_unique
+
+
+def _merge_sorted(x, y, by, how, suffix):
+    """Join x and y that are both sorted on `by`, as `pd.merge()` does"""
+    # get the column layout from pd.merge(), only works on empty frames
+    columns = pd.merge(
+        x.iloc[:0, :],
+        y.iloc[:0, :],
+        on=by,
+        how=how,
+        suffixes=suffix,
+    ).columns
+    ret = x.set_index(by).join(
+        y.set_index(by),
+        how=how,
+        lsuffix=suffix[0],
+        rsuffix=suffix[1],
+    )
+    return ret.reset_index()[columns]
+
+
 def _merge_on(by):
     """Calculate argument on for pandas.merge()"""
     if by is None:
@@ -342,3 +451,94 @@ def _merge_on(by):
     if isinstance(by, dict):
         return {"left_on": list(by), "right_on": list(by.values())}
     return {"on": by}
+
+
+@register_verb(
+    DataFrame,
+    context=Context.EVAL,
+    kw_context={"on": Context.SELECT, "by": Context.SELECT},
+)
+def asof_join(
+    x: DataFrame,
+    y: DataFrame,
+    *,
+    on: Str | Dict[str, str],
+    by: Data[Str] | Dict[str, str] | None = None,
+    suffix: Data[Str] = ("_x", "_y"),
+    tolerance: Any = None,
+    direction: str = "backward",
+    allow_exact_matches: bool = True,
+) -> DataFrame:
+    """As-of (rolling) join, matching each row of `x` to the nearest key
+    in `y`, instead of an exact match.
+
+    This is a wrapper of `pandas.merge_asof()`. Unlike that function,
+    `x` and `y` do not need to be sorted by `on`. The order of rows of `x`
+    is kept in the result.
+
+    Args:
+        x: The left data frame
+        y: The right data frame
+        on: The column to match nearest keys. Usually a time column.
+            Use a dict (`{"left_col": "right_col"}`) if the column names
+            are different. In such a case, both columns are kept.
+        by: Columns to be matched exactly before the nearest key matching.
+            Use a dict if the column names are different in `x` and `y`.
+        suffix: Suffixes for the non-joined duplicate columns
+        tolerance: Select the nearest key within this range.
+            Must be compatible with the type of `on` column
+            (e.g. a `pandas.Timedelta` for datetime columns)
+        direction: Whether to search for prior (`"backward"`), subsequent
+            (`"forward"`) or the closest (`"nearest"`) matches.
+        allow_exact_matches: Whether to match the same `on` value.
+            If False, only strictly less-than/greater-than values are matched.
+
+    Returns:
+        The joined data frame, with the grouping structure of `x`
+    """
+    newx = DataFrame(x, copy=False)
+    y = DataFrame(y, copy=False)
+
+    if isinstance(on, dict):
+        left_on, right_on = next(iter(on.items()))
+    else:
+        if not is_scalar(on):
+            on = list(on)
+            if len(on) != 1:
+                raise ValueError("`on` must be a single column.")
+            on = on[0]
+        left_on = right_on = on
+
+    kwargs: Dict[str, Any] = {}
+    if isinstance(by, dict):
+        kwargs["left_by"] = list(by)
+        kwargs["right_by"] = list(by.values())
+    elif by is not None:
+        kwargs["by"] = [by] if is_scalar(by) else list(by)
+
+    # merge_asof requires both sides to be sorted by the key
+    order = None
+    if not newx[left_on].is_monotonic_increasing:
+        order = newx[left_on].argsort(kind="stable").to_numpy()
+        newx = newx.take(order)
+    if not y[right_on].is_monotonic_increasing:
+        y = y.sort_values(right_on, kind="stable")
+
+    ret = pd.merge_asof(
+        newx,
+        y,
+        left_on=left_on,
+        right_on=right_on,
+        suffixes=suffix,
+        tolerance=tolerance,
+        direction=direction,
+        allow_exact_matches=allow_exact_matches,
+        **kwargs,
+    )
+    if order is not None:
+        # restore the original order of x
+        inverse = np.empty_like(order)
+        inverse[order] = np.arange(order.size)
+        ret = ret.take(inverse).reset_index(drop=True)
+
+    return reconstruct_tibble(ret, x)
@@ -6,13 +6,14 @@ https://github.com/tidyverse/dplyr/blob/master/R/lead-lag.R
 import numpy as np
 from datar.apis.dplyr import with_order, lead, lag
 
-from ...pandas import Series
+from ...pandas import Series, SeriesGroupBy, get_obj
 from ...common import is_scalar
-from ...utils import as_series
+from ...utils import as_series, get_grouper, split_offsets
 from ...factory import func_bootstrap
 
 
-def _shift(x, n, default=None, order_by=None):
+def _check_shift_args(n, default):
+    """Check n and default of lead/lag, and return the scalar default"""
     if not isinstance(n, int):
         raise ValueError("`lead-lag` expect an integer for `n`.")
 
@@ -22,6 +23,12 @@ def _shift(x, n, default=None, order_by=None):
     if default is not None and not is_scalar(default):
         default = default[0]
 
+    return default
+
+
+def _shift(x, n, default=None, order_by=None):
+    default = _check_shift_args(n, default)
+
     if order_by is not None:
         # newx = newx.reset_index(drop=True)
         out = with_order(order_by, Series.shift, x, n, fill_value=default)
@@ -31,6 +38,54 @@ def _shift(x, n, default=None, order_by=None):
     return out
 
 
+def _shift_grouped(x: SeriesGroupBy, n, default=None, order_by=None):
+    """Shift the values in all groups at once
+
+    The rows are put together by the groups (and ordered by `order_by`
+    within them) with one stable sort, so that the values are shifted by
+    their positions in the groups, and then put back to where they were.
+    """
+    default = _check_shift_args(n, default)
+
+    grouper = get_grouper(x)
+    obj = get_obj(x)
+    codes = grouper.codes_info
+    if order_by is None:
+        order, offsets = split_offsets(codes, grouper.ngroups)
+    else:
+        if isinstance(order_by, SeriesGroupBy):
+            order_by = get_obj(order_by)
+        rows = (
+            Series(np.asarray(order_by))
+            .sort_values(kind="stable", na_position="last")
+            .index.to_numpy()
+        )
+        order, offsets = split_offsets(codes[rows], grouper.ngroups)
+        order = rows[order]
+
+    sizes = np.diff(offsets)
+    gids = np.repeat(np.arange(grouper.ngroups), sizes)
+    # the positions in the groups where the values come from
+    src = np.arange(order.size) - offsets[gids] - n
+    valid = (src >= 0) & (src < sizes[gids])
+
+    out = (
+        obj.take(order[(offsets[gids] + src)[valid]])
+        .set_axis(order[valid])
+        .reindex(range(obj.size), fill_value=default)
+        .set_axis(obj.index)
+    )
+    out = out.groupby(
+        grouper,
+        observed=x.observed,
+        sort=x.sort,
+        dropna=x.dropna,
+    )
+    if getattr(x, "is_rowwise", False):
+        out.is_rowwise = True
+    return out
+
+
 @lead.register(object, backend="pandas")
 def _lead_obj(x, n=1, default=np.nan, order_by=None):
     return _shift(as_series(x), n=-n, default=default, order_by=order_by)
@@ -53,6 +108,11 @@ def _lead(x, n=1, default=np.nan, order_by=None):
     return _shift(x, n=-n, default=default, order_by=order_by)
 
 
+@lead.register(SeriesGroupBy, backend="pandas")
+def _lead_sgb(x, n=1, default=np.nan, order_by=None):
+    return _shift_grouped(x, n=-n, default=default, order_by=order_by)
+
+
 @lag.register(object, backend="pandas")
 def _lag_obj(x, n=1, default=np.nan, order_by=None):
     return _shift(as_series(x), n=n, default=default, order_by=order_by)
@@ -65,3 +125,8 @@ def _lag(x, n=1, default=np.nan, order_by=None):
     See lead()
     """
     return _shift(x, n=n, default=default, order_by=order_by)
+
+
+@lag.register(SeriesGroupBy, backend="pandas")
+def _lag_sgb(x, n=1, default=np.nan, order_by=None):
+    return _shift_grouped(x, n=n, default=default, order_by=order_by)
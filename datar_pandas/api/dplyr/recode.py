@@ -74,48 +74,76 @@ def _check_type(val, out_type, name):
         raise TypeError(f"{name} must be {out_type.__name__}, not {val.dtype.name}.")
 
 
-def _replace_with(
-    x,
-    out_type,
-    i,
-    val,
-    name,
-):
-    """Replace with given value at index"""
+def _level_positions(levels, values):
+    """Get the positions of the values to recode in the levels, -1 for
+    the ones not in the levels
+
+    The levels are hashed as python objects, so that the values are
+    matched as `==` does, for example, 1 matches True.
+    """
+    positions = {level: i for i, level in enumerate(levels)}
+    return [positions.get(val, -1) for val in values]
+
+
+def _replace_in_table(table, rows, out_type, matched, val, name, codes):
+    """Replace the values in the lookup table where matched
+
+    A single value goes into the table, and values for each element are
+    kept in `rows` to replace the elements after the table is looked up.
+    """
     # https://github.com/tidyverse/dplyr/blob/HEAD/R/utils-replace-with.R
     if val is None:
-        return x
+        return
 
     if is_scalar(val):
         val = np.array([val])
     else:
         val = np.array(val)
 
-    _check_length(val, x, name)
+    _check_length(val, codes, name)
     if not pd.isnull(val).any():
         _check_type(val, out_type, name)
     # check_class(val, x, name)
 
-    i[pd.isnull(i)] = False
-
     if len(val) == 1:
-        x[i] = val[0]
+        table[matched] = val[0]
     else:
-        x[i] = val[i]
+        rows.append((matched, val))
+
+
+def _lookup(table, rows, codes):
+    """Look up the table by the codes, the last item of the table for
+    code -1, and replace the elements kept in `rows`
+    """
+    out = table[codes]
+    for matched, val in rows:
+        mask = np.zeros(table.size, dtype=bool)
+        mask[matched] = True
+        i = mask[codes]
+        out[i] = val[i]
+    return out
+
 
-    return x
+def _keep_unreplaced(table, levels, unreplaced, out_type, codes):
+    """Keep the unreplaced levels as they are, which is the default
+    aliased to `_x`
+    """
+    if (codes >= 0).all():
+        _check_type(np.asarray(levels), out_type, "`_default`")
+    table[unreplaced] = np.append(np.asarray(levels, dtype=object), np.nan)[
+        unreplaced
+    ]
 
 
 def _validate_recode_default(
     default,
     x,
-    out,
     out_type,
-    replaced,
+    all_replaced,
 ):
     """Validate default for recoding"""
     default = _recode_default(x, default, out_type)
-    if default is None and sum(replaced & ~pd.isnull(x)) < len(out[~pd.isnull(x)]):
+    if default is None and not all_replaced:
         logger.warning(
             "Unreplaced values treated as NA as `_x` is not compatible. "
             "Please specify replacements exhaustively or supply `_default`",
@@ -131,6 +159,46 @@ def _recode_default(x, default, out_type):
     return default
 
 
+def _recode_values(_x, values, _default, _missing, name, na):
+    """Recode the values with a lookup table of the unique values"""
+    codes, uniques = pd.factorize(_x)
+    # the extra item of the table is for the NAs (code -1)
+    table = np.array([np.nan] * (len(uniques) + 1), dtype=object)
+    replaced = np.zeros(len(uniques) + 1, dtype=bool)
+    rows = []
+    out_type = None
+
+    positions = _level_positions(uniques, values)
+    for val, pos in zip(values, positions):
+        if out_type is None:
+            out_type = type(values[val])
+        matched = [pos] if pos >= 0 else []
+        _replace_in_table(
+            table, rows, out_type, matched, values[val], name(val), codes
+        )
+        replaced[matched] = True
+
+    unreplaced = ~replaced
+    unreplaced[-1] = False
+    _default = _validate_recode_default(
+        _default, _x, out_type, not unreplaced.any()
+    )
+    if _default is _x:
+        _keep_unreplaced(table, uniques, unreplaced, out_type, codes)
+    else:
+        _replace_in_table(
+            table, rows, out_type, unreplaced, _default, "`_default`", codes
+        )
+
+    missing = np.append(np.asarray(uniques == na, dtype=bool), True)
+    _replace_in_table(table, rows, out_type, missing, _missing, "`_missing`", codes)
+
+    out = _lookup(table, rows, codes)
+    if out_type and not pd.isnull(out).any():
+        out = out.astype(out_type)
+    return out
+
+
 def _recode_numeric(
     _x,
     *args,
@@ -144,31 +212,14 @@ def _recode_numeric(
     if any(not isinstance(val, int) for val in values):
         raise ValueError("All values must be unnamed (or named with integers).")
 
-    n = len(_x)
-    out = np.array([np.nan] * n, dtype=object)
-    replaced = np.array([False] * n)
-    out_type = None
-
-    for val in values:
-        if out_type is None:
-            out_type = type(values[val])
-        out = _replace_with(out, out_type, _x == val, values[val], f"Element {val}")
-        replaced[_x == val] = True
-
-    _default = _validate_recode_default(_default, _x, out, out_type, replaced)
-    out = _replace_with(
-        out, out_type, ~replaced & ~pd.isnull(_x), _default, "`_default`"
-    )
-    out = _replace_with(
-        out,
-        out_type,
-        pd.isnull(_x) | (_x == NA_integer_),
+    return _recode_values(
+        _x,
+        values,
+        _default,
         _missing,
-        "`_missing`",
+        lambda val: f"Element {val}",
+        NA_integer_,
     )
-    if out_type and not pd.isnull(out).any():
-        out = out.astype(out_type)
-    return out
 
 
 def _recode_character(
@@ -184,31 +235,14 @@ def _recode_character(
     if not all(isinstance(val, str) for val in values):
         raise ValueError("All values must be named.")
 
-    n = len(_x)
-    out = np.array([np.nan] * n, dtype=object)
-    replaced = np.array([False] * n)
-    out_type = None
-
-    for val in values:
-        if out_type is None:
-            out_type = type(values[val])
-        out = _replace_with(out, out_type, _x == val, values[val], f"`{val}`")
-        replaced[_x == val] = True
-
-    _default = _validate_recode_default(_default, _x, out, out_type, replaced)
-    out = _replace_with(
-        out, out_type, ~replaced & ~pd.isnull(_x), _default, "`_default`"
-    )
-    out = _replace_with(
-        out,
-        out_type,
-        pd.isnull(_x) | (_x == NA_character_),
+    return _recode_values(
+        _x,
+        values,
+        _default,
         _missing,
-        "`_missing`",
+        lambda val: f"`{val}`",
+        NA_character_,
     )
-    if out_type and not pd.isnull(out).any():
-        out = out.astype(out_type)
-    return out
 
 
 def _check_args(values, default, missing):
@@ -257,33 +291,52 @@ def _recode_cat(
     if _missing is not None:
         raise ValueError("`_missing` is not supported for factors.")
 
-    n = len(x)
     _check_args(values, _default, _missing)
-    out = np.array([np.nan] * n, dtype=object)
-    replaced = np.array([False] * n)
+    categories = x.categories
+    codes = x.codes
+    # the extra item of the table is for the NAs (code -1)
+    table = np.array([np.nan] * (len(categories) + 1), dtype=object)
+    replaced = np.zeros(len(categories) + 1, dtype=bool)
+    used = np.zeros(len(categories) + 1, dtype=bool)
+    used[codes] = True
+    rows = []
     out_type = None
 
-    for val in values:
+    positions = _level_positions(categories, values)
+    for val, pos in zip(values, positions):
         if out_type is None:
             out_type = type(_get_first([values[val]]))
-        out = _replace_with(
-            out,
-            out_type,
-            # _x.categories == val,
-            x == val,
-            values[val],
-            f"`{val}`",
+        matched = [pos] if pos >= 0 else []
+        _replace_in_table(
+            table, rows, out_type, matched, values[val], f"`{val}`", codes
         )
-        # _x may have duplicated values
-        # replaced[_x.categories == val] = True
-        replaced[x == val] = True
+        replaced[matched] = True
 
-    _default = _validate_recode_default(_default, x, out, out_type, replaced)
-    out = _replace_with(out, out_type, ~replaced, _default, "`_default`")
+    _default = _validate_recode_default(
+        _default, x, out_type, not (used & ~replaced)[:-1].any()
+    )
+    if _default is x:
+        _keep_unreplaced(table, categories, ~replaced, out_type, codes)
+    else:
+        _replace_in_table(
+            table, rows, out_type, ~replaced, _default, "`_default`", codes
+        )
 
-    if out_type is str:
-        return Series(Categorical(out), index=_x.index, name=_x.name)
-    return Series(out[x.codes], index=_x.index, name=_x.name)
+    if out_type is not str:
+        return Series(_lookup(table, rows, codes), index=_x.index, name=_x.name)
+
+    if rows:
+        out = Categorical(_lookup(table, rows, codes))
+    else:
+        # the categories are inferred from the values used, as
+        # Categorical() does with the recoded values
+        recoded = table[used]
+        out_categories = Categorical(recoded[pd.notnull(recoded)]).categories
+        out = Categorical.from_codes(
+            out_categories.get_indexer(table)[codes],
+            categories=out_categories,
+        )
+    return Series(out, index=_x.index, name=_x.name)
 
 
 @func_bootstrap(recode, kind="transform")
@@ -350,10 +403,15 @@ def _recode_factor_bootstrap(
 
     out_type = type(_get_first(recoded))
     _default = _recode_default(_x, _default, out_type)
+    if _default is None:
+        _default = []
+    elif not is_scalar(_default):
+        # the default can be `_x`, whose unique values are enough
+        _default = unique(_default)
     all_levels = unique(
         Collection(
             list(values.values()),
-            [] if _default is None else _default,
+            _default,
             [] if _missing is None else _missing,
         )
     )
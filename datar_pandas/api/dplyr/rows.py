@@ -3,7 +3,9 @@
 https://github.com/tidyverse/dplyr/blob/master/R/rows.R
 """
 
-from typing import Any, Tuple, cast
+import weakref
+from typing import Any, Dict, List, Tuple, cast
+
 import numpy as np
 from datar.core.utils import logger, arg_match
 from datar.apis.dplyr import (
@@ -18,9 +20,10 @@ from datar.apis.dplyr import (
 )
 
 from ... import pandas as pd
-from ...pandas import DataFrame
-from ...common import is_scalar, setdiff
+from ...pandas import DataFrame, Index, MultiIndex, SeriesGroupBy, get_obj
+from ...common import intersect, is_scalar, setdiff
 from ...contexts import Context
+from ...tibble import TibbleGrouped
 
 _meta_args = {"__ast_fallback": "normal", "__backend": "pandas"}
 
@@ -60,7 +63,7 @@ def _rows_append(x, y, **kwargs):
 
 
 @rows_update.register(DataFrame, context=Context.EVAL, backend="pandas")
-def _rows_update(x, y, by=None, unmatched="error", **kwargs):
+def _rows_update(x, y, by=None, unmatched="error", in_place=False, **kwargs):
     if kwargs:  # pragma: no cover
         raise ValueError("Unsupported arguments: %s" % kwargs.keys())
 
@@ -70,6 +73,15 @@ def _rows_update(x, y, by=None, unmatched="error", **kwargs):
     _rows_check_key_df(x, key, df_name="x")
     _rows_check_key_df(y, key, df_name="y")
 
+    if in_place:
+        pos_x, pos_y = _rows_locate(x, y, key)
+        if pos_y.size < y.shape[0] and unmatched == "error":
+            raise ValueError("Attempting to update missing rows.")
+
+        _rows_check_y_unique(y, key, pos_y)
+        _rows_put(x, pos_x, y, pos_y, setdiff(y.columns, key))
+        return x
+
     idx_x, idx_y = _rows_match(x[key], y[key])
 
     if y.index.difference(idx_y).size > 0 and unmatched == "error":
@@ -84,7 +96,7 @@ def _rows_update(x, y, by=None, unmatched="error", **kwargs):
 
 
 @rows_patch.register(DataFrame, context=Context.EVAL, backend="pandas")
-def _rows_patch(x, y, by=None, unmatched="error", **kwargs):
+def _rows_patch(x, y, by=None, unmatched="error", in_place=False, **kwargs):
     if kwargs:  # pragma: no cover
         raise ValueError("Unsupported arguments: %s" % kwargs.keys())
 
@@ -94,6 +106,18 @@ def _rows_patch(x, y, by=None, unmatched="error", **kwargs):
     _rows_check_key_df(x, key, df_name="x")
     _rows_check_key_df(y, key, df_name="y")
 
+    if in_place:
+        pos_x, pos_y = _rows_locate(x, y, key)
+        if pos_x.size == 0:
+            raise ValueError("Attempting to patch missing rows.")
+
+        if pos_y.size < y.shape[0] and unmatched == "error":
+            raise ValueError("`y` must contain keys that already exist in `x`.")
+
+        _rows_check_y_unique(y, key, pos_y)
+        _rows_put(x, pos_x, y, pos_y, setdiff(y.columns, key), patch=True)
+        return x
+
     idx_x, idx_y = _rows_match(x[key], y[key])
 
     if idx_x.size == 0:
@@ -120,11 +144,31 @@ def _rows_patch(x, y, by=None, unmatched="error", **kwargs):
 
 
 @rows_upsert.register(DataFrame, context=Context.EVAL, backend="pandas")
-def _rows_upsert(x, y, by=None):
+def _rows_upsert(x, y, by=None, in_place=False, **kwargs):
+    if kwargs:  # pragma: no cover
+        raise ValueError("Unsupported arguments: %s" % kwargs.keys())
+
     key = _rows_check_key(by, x, y)
     _rows_check_key_df(x, key, df_name="x")
     _rows_check_key_df(y, key, df_name="y")
 
+    if in_place:
+        pos_x, pos_y = _rows_locate(x, y, key)
+        _rows_check_y_unique(y, key, pos_y)
+        _rows_put(x, pos_x, y, pos_y, setdiff(y.columns, key))
+
+        unmatched = np.ones(y.shape[0], dtype=bool)
+        unmatched[pos_y] = False
+        if not unmatched.any():
+            return x
+
+        # rows can't be appended in place
+        new = y.iloc[unmatched, :]
+        out = bind_rows(x, new, **cast(Any, _meta_args))
+        index = _rows_key_index(x, key)
+        _rows_cache_key_index(out, key, index.append(_rows_keys(new, key)))
+        return out
+
     idx_x, idx_y = _rows_match(x[key], y[key])
 
     if np.unique(idx_x).size < idx_x.size:
@@ -141,6 +185,7 @@ def _rows_delete(
     y,
     by=None,
     unmatched="error",
+    in_place=False,
     **kwargs,
 ):
     if kwargs:  # pragma: no cover
@@ -156,6 +201,19 @@ def _rows_delete(
     if len(extra_cols) > 0:
         logger.info("Ignoring extra columns: %s", extra_cols)
 
+    if in_place:
+        pos_x, pos_y = _rows_locate(x, y, key)
+        if np.unique(pos_y).size < y.shape[0] and unmatched == "error":
+            raise ValueError("Attempting to delete missing rows.")
+
+        # rows can't be deleted in place
+        kept = np.ones(x.shape[0], dtype=bool)
+        kept[pos_x] = False
+        out = x.iloc[kept, :]
+        index = _rows_key_index(x, key)
+        _rows_cache_key_index(out, key, index[kept])
+        return out
+
     idx_x, idx_y = _rows_match(x[key], y[key])
 
     if y.index.difference(idx_y).size > 0 and unmatched == "error":
@@ -220,3 +278,127 @@ def _rows_match(
         np.asarray(df[x_id_col].values).astype(int),
         np.asarray(df[y_id_col].values).astype(int),
     )
+
+
+# Hash indexes of the key columns, built for `in_place=True` and
+# kept along with the data frames, keyed by the `id()`s of the data frames
+_KEY_INDEXES: Dict[int, Tuple[weakref.ref, Tuple, List, Index]] = {}
+
+
+def _rows_column(df: pd.DataFrame, col) -> pd.Series:
+    """Get a column as a Series, even from a grouped data frame"""
+    ser = df[col]
+    return get_obj(ser) if isinstance(ser, SeriesGroupBy) else ser
+
+
+def _rows_keys(df: pd.DataFrame, key) -> Index:
+    """Turn the key columns into an index"""
+    if len(key) == 1:
+        return Index(_rows_column(df, key[0]))
+    return MultiIndex.from_frame(DataFrame(df[key], copy=False))
+
+
+def _rows_key_arrays(df: pd.DataFrame, key) -> List:
+    """Get the underlying arrays of the key columns, without copying"""
+    out = []
+    for col in key:
+        ser = _rows_column(df, col)
+        out.append(
+            ser.to_numpy() if isinstance(ser.dtype, np.dtype) else ser.array
+        )
+    return out
+
+
+def _rows_same_arrays(arrays1: List, arrays2: List) -> bool:
+    """Check if the key arrays are the same (not only equal) ones"""
+    for arr1, arr2 in zip(arrays1, arrays2):
+        if not isinstance(arr1, np.ndarray):
+            if arr1 is not arr2:
+                return False
+        elif (
+            not isinstance(arr2, np.ndarray)
+            or arr1.shape != arr2.shape
+            or arr1.strides != arr2.strides
+            or arr1.__array_interface__["data"] != arr2.__array_interface__["data"]
+        ):
+            return False
+    return True
+
+
+def _rows_cache_key_index(df: pd.DataFrame, key, index: Index) -> None:
+    """Save the key index for the data frame"""
+    df_id = id(df)
+    _KEY_INDEXES[df_id] = (
+        weakref.ref(df, lambda _: _KEY_INDEXES.pop(df_id, None)),
+        tuple(key),
+        _rows_key_arrays(df, key),
+        index,
+    )
+
+
+def _rows_key_index(df: pd.DataFrame, key) -> Index:
+    """Get the index of the key columns of the data frame.
+
+    The index (and its hash table) is built once and reused as long as the
+    key columns are not replaced.
+    """
+    cached = _KEY_INDEXES.get(id(df))
+    if (
+        cached is not None
+        and cached[0]() is df
+        and cached[1] == tuple(key)
+        and _rows_same_arrays(cached[2], _rows_key_arrays(df, key))
+    ):
+        return cached[3]
+
+    index = _rows_keys(df, key)
+    _rows_cache_key_index(df, key, index)
+    return index
+
+
+def _rows_locate(
+    x: pd.DataFrame,
+    y: pd.DataFrame,
+    key,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the positions of the matched rows in x and y, using the key
+    index of x"""
+    index = _rows_key_index(x, key)
+    if not index.is_unique:
+        return _rows_match(
+            x[key].reset_index(drop=True),
+            y[key].reset_index(drop=True),
+        )
+
+    pos_x = index.get_indexer(_rows_keys(y, key))
+    pos_y = np.flatnonzero(pos_x >= 0)
+    return pos_x[pos_y], pos_y
+
+
+def _rows_check_y_unique(y: pd.DataFrame, key, pos_y: np.ndarray) -> None:
+    """Check if the matched keys of y are unique"""
+    if not _rows_keys(y.iloc[np.unique(pos_y), :], key).is_unique:
+        raise ValueError("`y` key values must be unique.")
+
+
+def _rows_put(
+    x: pd.DataFrame,
+    pos_x: np.ndarray,
+    y: pd.DataFrame,
+    pos_y: np.ndarray,
+    cols,
+    patch: bool = False,
+) -> None:
+    """Put the values of the matched rows of y into x in place, column by
+    column"""
+    for col in cols:
+        loc = x.columns.get_loc(col)
+        values = _rows_column(y, col).to_numpy()[pos_y]
+        if patch:
+            missing = x.iloc[pos_x, loc].isna().to_numpy()
+            x.iloc[pos_x[missing], loc] = values[missing]
+        else:
+            x.iloc[pos_x, loc] = values
+
+    if isinstance(x, TibbleGrouped):
+        x.regroup(hard=len(intersect(cols, x.group_vars)) > 0)
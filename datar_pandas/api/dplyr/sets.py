@@ -6,6 +6,7 @@ https://github.com/tidyverse/dplyr/blob/master/R/sets.r
 from typing import Any, cast
 
 import numpy as np
+from datar_numpy.utils import make_array
 from datar.apis.dplyr import (
     ungroup,
     bind_rows,
@@ -20,7 +21,15 @@ from datar.apis.dplyr import (
 from ... import pandas as pd
 from ...utils import meta_kwargs
 from ...broadcast import get_grouper, _grouper_compatible
-from ...pandas import DataFrame, SeriesGroupBy
+from ...pandas import (
+    DataFrame,
+    Series,
+    SeriesGroupBy,
+    factorize,
+    get_obj,
+    hash_pandas_object,
+    is_float_dtype,
+)
 from ...common import (
     setdiff as _setdiff,
     union as _union,
@@ -50,6 +59,130 @@ def _check_xy(x, y):
         raise ValueError("\n".join(msg))
 
 
+def _take_rows(x, y, col, pos):
+    """Take values of a column at positions of the rows of x and y stacked"""
+    nx = x.shape[0]
+    in_x = pos < nx
+    out = pd.concat(
+        [x[col].take(pos[in_x]), y[col].take(pos[~in_x] - nx)],
+        ignore_index=True,
+    )
+    order = np.concatenate([np.flatnonzero(in_x), np.flatnonzero(~in_x)])
+    return out.take(np.argsort(order, kind="stable")).reset_index(drop=True)
+
+
+def _row_codes(x, y):
+    """Factorize the rows of x and y together, by hashing each row into
+    an uint64.
+
+    The rows with the same hash are checked to be really equal, so that the
+    codes are exact.
+
+    Args:
+        x: The first data frame (ungrouped)
+        y: The second data frame (ungrouped), with columns in the order of x
+
+    Returns:
+        The codes of rows of x and y, and the number of unique rows.
+        None if x and y can't be hashed together (e.g. columns have
+        different dtypes) or there are hash collisions.
+    """
+    if not x.columns.is_unique or any(
+        x[col].dtype != y[col].dtype for col in x.columns
+    ):
+        return None
+
+    hashes = []
+    for df in (x, y):
+        df = df.copy(deep=False)
+        for col in df.columns:
+            if is_float_dtype(df[col].dtype):
+                # -0.0 and 0.0 are equal but hashed differently
+                df[col] = df[col] + 0.0
+        hashes.append(hash_pandas_object(df, index=False).to_numpy())
+
+    codes, uniques = factorize(np.concatenate(hashes))
+    # the first positions of the codes
+    firsts = np.empty(uniques.size, dtype=np.intp)
+    firsts[codes[::-1]] = np.arange(codes.size - 1, -1, -1)
+    # rows to check against the first rows with the same hashes
+    dups = np.flatnonzero(firsts[codes] != np.arange(codes.size))
+    if dups.size > 0:
+        for col in x.columns:
+            dupvals = _take_rows(x, y, col, dups)
+            firstvals = _take_rows(x, y, col, firsts[codes[dups]])
+            equal = (dupvals == firstvals).fillna(False) | (
+                dupvals.isna() & firstvals.isna()
+            )
+            if not equal.all():
+                # hash collision
+                return None
+
+    nx = x.shape[0]
+    return codes[:nx], codes[nx:], uniques.size
+
+
+def _first_rows(codes):
+    """Mark the first occurrences of the codes, which are assigned in the
+    order of appearance"""
+    seen = np.maximum.accumulate(codes)
+    out = np.ones(codes.size, dtype=bool)
+    out[1:] = codes[1:] > seen[:-1]
+    return out
+
+
+def _hash_setop(x, y, how):
+    """Do set operations on data frames by the row codes
+
+    Args:
+        x: The first data frame (ungrouped)
+        y: The second data frame (ungrouped)
+        how: One of intersect, setdiff, union and symdiff
+
+    Returns:
+        The result data frame, or None if the rows can't be hashed
+    """
+    y = y[x.columns]
+    try:
+        codes = _row_codes(x, y)
+    except TypeError:  # pragma: no cover
+        codes = None
+    if codes is None:
+        return None
+
+    xcodes, ycodes, ncodes = codes
+    in_x = np.zeros(ncodes, dtype=bool)
+    in_x[xcodes] = True
+    in_y = np.zeros(ncodes, dtype=bool)
+    in_y[ycodes] = True
+    firsts = _first_rows(np.concatenate([xcodes, ycodes]))
+    xfirsts = firsts[: xcodes.size]
+    yfirsts = firsts[xcodes.size :]
+
+    if how == "intersect":
+        return x[xfirsts & in_y[xcodes]].reset_index(drop=True)
+
+    if how == "setdiff":
+        return x[xfirsts & ~in_y[xcodes]].reset_index(drop=True)
+
+    if how == "symdiff":
+        xfirsts &= ~in_y[xcodes]
+        yfirsts &= ~in_x[ycodes]
+
+    out = pd.concat([x[xfirsts], y[yfirsts]], ignore_index=True)
+    # keys are sorted by the outer merge
+    try:
+        out = out.sort_values(
+            by=out.columns.to_list(),
+            kind="mergesort",
+            na_position="last",
+            ignore_index=True,
+        )
+    except TypeError:  # pragma: no cover
+        return None
+    return out
+
+
 @intersect.register(DataFrame, backend="pandas")
 def _intersect_df(x: DataFrame, y: DataFrame) -> DataFrame:
     """Intersect of two dataframes
@@ -62,12 +195,22 @@ def _intersect_df(x: DataFrame, y: DataFrame) -> DataFrame:
         The dataframe of intersect of input dataframes
     """
     _check_xy(x, y)
+    out = _hash_setop(
+        ungroup(x, **META_KWARGS),
+        ungroup(y, **META_KWARGS),
+        "intersect",
+    )
+    if out is not None:
+        if isinstance(y, TibbleGrouped):
+            return reconstruct_tibble(out, y)
+        return out
+
     from .distinct import distinct
 
     out = distinct(
         pd.merge(x, ungroup(y, **META_KWARGS), how="inner"),
         **META_KWARGS,
-    )
+    ).reset_index(drop=True)
     # In pandas 3, merging str (StringDtype) with category can produce object
     # Restore x's column dtypes when the merge produced object dtype
     for col in x.columns:
@@ -94,35 +237,87 @@ def _intersect_grouped(x, y):
     return reconstruct_tibble(out, x)
 
 
-@intersect.register(SeriesGroupBy, backend="pandas")
-def _intersect_sg(x, y) -> SeriesGroupBy:
-    """Intersect of two SeriesGroupBy objects"""
-    if isinstance(x, SeriesGroupBy) and isinstance(y, SeriesGroupBy):
+def _sgb_values(x, grouper):
+    """Get the group codes (regarding the grouper) and values of x, which is
+    either a SeriesGroupBy object or a vector to be used for all groups"""
+    if isinstance(x, SeriesGroupBy):
         xgrouper = get_grouper(x)
-        ygrouper = get_grouper(y)
-        if not _grouper_compatible(xgrouper, ygrouper, broadcastable=False):
-            raise ValueError("Groupby objects are not compatible for intersection.")
-
-        # intersect each group
-        y_groups = y.groups
-        y_obj = y.obj
-        x = (
-            x.apply(lambda s: intersect(s, y_obj.iloc[y_groups[s.name]]))
-            .explode(ignore_index=False)
-            .convert_dtypes()
-        )
-        return x.groupby(x.index)
+        codes = xgrouper.codes_info
+        if xgrouper is not grouper:
+            codes = np.append(
+                grouper.result_index.get_indexer(xgrouper.result_index),
+                -1,
+            )[codes]
+        return codes, get_obj(x).reset_index(drop=True)
+
+    x = Series(make_array(x))
+    return (
+        np.repeat(np.arange(grouper.ngroups), x.size),
+        x.take(np.tile(np.arange(x.size), grouper.ngroups)).reset_index(drop=True),
+    )
 
-    if isinstance(x, SeriesGroupBy):
-        x = (
-            x.apply(lambda s: intersect(s, y))
-            .explode(ignore_index=False)
-            .convert_dtypes()
+
+def _sgb_setop(x, y, how: str) -> SeriesGroupBy:
+    """Set operations on each group, where at least one of x and y is
+    a SeriesGroupBy object.
+
+    All groups are done at once, by hashing the (group code, value) pairs.
+    Like `apply()` + `explode()`, a group with nothing left gets a missing
+    value.
+    """
+    if isinstance(x, SeriesGroupBy) and isinstance(y, SeriesGroupBy):
+        grouper = get_grouper(x)
+        if not _grouper_compatible(grouper, get_grouper(y), broadcastable=False):
+            raise ValueError(
+                f"Groupby objects are not compatible for {how}."
+            )
+    else:
+        grouper = get_grouper(x if isinstance(x, SeriesGroupBy) else y)
+
+    name = get_obj(x if isinstance(x, SeriesGroupBy) else y).name
+    xcodes, xvals = _sgb_values(x, grouper)
+    ycodes, yvals = _sgb_values(y, grouper)
+    xvals = xvals[xcodes >= 0].reset_index(drop=True)
+    xcodes = xcodes[xcodes >= 0]
+    yvals = yvals[ycodes >= 0].reset_index(drop=True)
+    ycodes = ycodes[ycodes >= 0]
+
+    vals = pd.concat([xvals, yvals], ignore_index=True)
+    vcodes, uniq = factorize(vals, use_na_sentinel=False)
+    keys = Series(np.concatenate([xcodes, ycodes]) * uniq.size + vcodes)
+    xkeys = keys.iloc[: xcodes.size]
+    if how == "union":
+        kept = ~keys.duplicated().to_numpy()
+        codes = np.concatenate([xcodes, ycodes])[kept]
+        vals = vals[kept]
+    else:
+        # NA's are not equal to each other as in numpy
+        matched = (
+            xkeys.isin(keys.iloc[xcodes.size :]).to_numpy()
+            & xvals.notna().to_numpy()
         )
-        return x.groupby(x.index)
+        kept = ~xkeys.duplicated().to_numpy()
+        kept &= matched if how == "intersect" else ~matched
+        codes = xcodes[kept]
+        vals = xvals[kept]
+
+    # groups with nothing left
+    empty = np.setdiff1d(np.arange(grouper.ngroups), codes)
+    codes = np.concatenate([codes, empty])
+    vals = vals.reset_index(drop=True).reindex(np.arange(codes.size))
+    order = np.argsort(codes, kind="stable")
+    out = Series(
+        vals.take(order).to_numpy(),
+        index=grouper.result_index.take(codes[order]),
+        name=name,
+    ).convert_dtypes()
+    return out.groupby(out.index)
 
-    y = y.apply(lambda s: intersect(x, s)).explode(ignore_index=False).convert_dtypes()
-    return y.groupby(y.index)
+
+@intersect.register(SeriesGroupBy, backend="pandas")
+def _intersect_sg(x, y) -> SeriesGroupBy:
+    """Intersect of two SeriesGroupBy objects"""
+    return _sgb_setop(x, y, "intersect")
 
 
 @union.register(DataFrame, backend="pandas")
@@ -137,6 +332,16 @@ def _union_df(x, y):
         The dataframe of union of input dataframes
     """
     _check_xy(x, y)
+    out = _hash_setop(
+        ungroup(x, **META_KWARGS),
+        ungroup(y, **META_KWARGS),
+        "union",
+    )
+    if out is not None:
+        if isinstance(y, TibbleGrouped):
+            return reconstruct_tibble(out, y)
+        return out
+
     from .distinct import distinct
 
     out = distinct(
@@ -158,6 +363,12 @@ def _union_grouped(x, y):
     return reconstruct_tibble(out, x)
 
 
+@union.register(SeriesGroupBy, backend="pandas")
+def _union_sg(x, y) -> SeriesGroupBy:
+    """Union of two SeriesGroupBy objects"""
+    return _sgb_setop(x, y, "union")
+
+
 @setdiff.register(DataFrame, backend="pandas")
 def _setdiff_df(x, y):
     """Set diff of two dataframes
@@ -170,6 +381,16 @@ def _setdiff_df(x, y):
         The dataframe of setdiff of input dataframes
     """
     _check_xy(x, y)
+    out = _hash_setop(
+        ungroup(x, **META_KWARGS),
+        ungroup(y, **META_KWARGS),
+        "setdiff",
+    )
+    if out is not None:
+        if isinstance(y, TibbleGrouped):
+            return reconstruct_tibble(out, y)
+        return out
+
     indicator = "__datar_setdiff__"
     out = pd.merge(
         x,
@@ -185,7 +406,7 @@ def _setdiff_df(x, y):
         .drop(columns=[indicator])
         .reset_index(drop=True),
         **META_KWARGS,
-    )
+    ).reset_index(drop=True)
     # In pandas 3, merging str with category can produce object dtype
     for col in x.columns:
         if (
@@ -212,6 +433,12 @@ def _setdiff_grouped(x, y):
     return reconstruct_tibble(out, x)
 
 
+@setdiff.register(SeriesGroupBy, backend="pandas")
+def _setdiff_sg(x, y) -> SeriesGroupBy:
+    """Set diff of two SeriesGroupBy objects"""
+    return _sgb_setop(x, y, "setdiff")
+
+
 @union_all.register(object, backend="pandas")
 def _union_all_obj(x, y):
     return np.concatenate([x, y])
@@ -261,6 +488,20 @@ def _set_equal_df(x, y, equal_na=True):
     y = ungroup(y, **META_KWARGS)
     _check_xy(x, y)
 
+    if x.shape[0] != y.shape[0] or not x.columns.equals(y.columns):
+        return False
+
+    try:
+        codes = _row_codes(x, y)
+    except TypeError:  # pragma: no cover
+        codes = None
+    if codes is not None:
+        xcodes, ycodes, ncodes = codes
+        return np.array_equal(
+            np.bincount(xcodes, minlength=ncodes),
+            np.bincount(ycodes, minlength=ncodes),
+        )
+
     x = x.sort_values(by=x.columns.to_list()).reset_index(drop=True)
     y = y.sort_values(by=y.columns.to_list()).reset_index(drop=True)
     return x.equals(y)
@@ -279,6 +520,10 @@ def _symdiff_df(x, y):
     _y = ungroup(y, **META_KWARGS)
     _check_xy(_x, _y)
 
+    out = _hash_setop(_x, _y, "symdiff")
+    if out is not None:
+        return reconstruct_tibble(out, x)
+
     out = setdiff(
         union(_x, _y, **META_KWARGS),
         intersect(_x, _y, **META_KWARGS),
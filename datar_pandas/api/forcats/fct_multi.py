@@ -1,17 +1,15 @@
 """Provides functions for multiple factors"""
 
-import itertools
 from typing import Any, cast
 
-from datar.apis.forcats import fct_c, fct_cross, lvls_union
+import numpy as np
+from datar.apis.forcats import fct_c, fct_cross
 
 from ...pandas import Categorical
-from ...common import intersect, is_null
+from ...common import is_scalar
 from ...utils import meta_kwargs
-from ..base import expand_grid
-from ..base.factor import factor, levels
-from ..base.string import paste
-from .utils import check_factor
+from ..base.factor import factor
+from .utils import check_factor, union_factors
 
 
 @fct_c.register(object, backend="pandas")
@@ -27,17 +25,16 @@ def _fct_c(*fs) -> Categorical:
     Returns:
         The concatenated factor
     """
-    meta_pd = cast(Any, meta_kwargs)
     if not fs:
-        return factor(**meta_pd)
+        return factor(**cast(Any, meta_kwargs))
 
-    levs = lvls_union(fs, **meta_pd)
-    allvals = list(itertools.chain(*fs))
-    return factor(
-        allvals,
-        levels=levs,
-        **meta_pd,
-    )
+    for fct in fs:
+        if is_scalar(fct) and not isinstance(fct, str):
+            raise TypeError(
+                f"All inputs to `fct_c()` must be factors, got {fct!r}"
+            )
+
+    return union_factors(fs)
 
 
 @fct_cross.register(object, backend="pandas")
@@ -59,34 +56,52 @@ def _fct_cross(
     Returns:
         The new factor
     """
-    meta_pd = cast(Any, meta_kwargs)
-    meta_np = cast(Any, {"__ast_fallback": "normal", "__backend": "numpy"})
     if not fs or (len(fs) == 1 and len(check_factor(fs[0])) == 0):
-        return factor(**meta_pd)
-
-    fs = [check_factor(fct) for fct in fs]
-    newf = paste(*fs, sep=sep, **meta_np)
-
-    old_levels = (
-        levels(fct, **meta_pd)
-        for fct in fs
-    )
-    grid = expand_grid(*old_levels, __ast_fallback="normal", __backend="pandas")
-    new_levels = paste(
-        *(grid[col] for col in grid),
-        sep=sep,
-        **meta_np,
-    )
-
-    if not keep_empty:
-        is_null_mask = is_null(newf)
-        new_levels = intersect(
-            new_levels,
-            newf[~is_null_mask],  # type: ignore[operator]
+        return factor(**cast(Any, meta_kwargs))
+
+    fs = [Categorical(check_factor(fct)) for fct in fs]
+    size = max(len(fct) for fct in fs)
+    if any(len(fct) not in (0, 1, size) for fct in fs):
+        raise ValueError(
+            "Factors to cross must have the same length or length 1, "
+            f"got {[len(fct) for fct in fs]}"
         )
 
-    return factor(
-        newf,
-        levels=new_levels,
-        **meta_pd,
-    )
+    # combine the codes as digits of a mixed radix number, the first factor
+    # being the most significant, which follows the order of levels
+    dims = tuple(len(fct.categories) for fct in fs)
+    codes = [
+        np.full(size, -1) if len(fct) == 0
+        else np.broadcast_to(fct.codes, size)
+        for fct in fs
+    ]
+    na_mask = np.logical_or.reduce([code < 0 for code in codes])
+    codes = [code[~na_mask] for code in codes]
+    combined = np.full(size, -1, dtype=np.int64)
+
+    if keep_empty:
+        digits = np.unravel_index(np.arange(int(np.prod(dims))), dims)
+        if codes[0].size > 0:
+            combined[~na_mask] = np.ravel_multi_index(codes, dims)
+    else:
+        # fold in one factor at a time, compressing the combinations to
+        # the observed ones each time, so that the radix never exceeds
+        # the number of rows. np.unique() keeps the order of the levels.
+        comb = np.zeros(codes[0].size, dtype=np.int64)
+        first = comb
+        for code, dim in zip(codes, dims):
+            _, first, comb = np.unique(
+                comb * dim + code,
+                return_index=True,
+                return_inverse=True,
+            )
+        combined[~na_mask] = comb
+        digits = [code[first] for code in codes]
+
+    # only build the labels for the levels used
+    new_levels = np.full(len(digits[0]), "", dtype=object)
+    for i, digit in enumerate(digits):
+        labels = fs[i].categories.astype(str).to_numpy(dtype=object)
+        new_levels = new_levels + (sep if i > 0 else "") + labels[digit]
+
+    return Categorical.from_codes(combined, categories=new_levels)
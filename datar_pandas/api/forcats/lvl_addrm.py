@@ -2,9 +2,10 @@
 
 from typing import Any, Iterable, List, Optional
 
+import numpy as np
+
 from datar.apis.forcats import (
     lvls_expand,
-    lvls_union,
     fct_expand,
     fct_explicit_na,
     fct_drop,
@@ -16,10 +17,11 @@ from ...pandas import Categorical
 from ...common import is_scalar, union, intersect, setdiff
 from ...contexts import Context
 from ...utils import meta_kwargs
+from ..base.asis import is_ordered
 from ..base.factor import levels
 from ..base.table import table
 from .lvls import refactor
-from .utils import check_factor, ForcatsRegType
+from .utils import check_factor, union_factors, ForcatsRegType
 
 
 @fct_expand.register(ForcatsRegType, context=Context.EVAL, backend="pandas")
@@ -132,7 +134,18 @@ def _fct_unify(
         A list of factors with the levels expanded
     """
     if levels is None:
-        levels = lvls_union(fs)
+        # one union of all factors, whose codes are already remapped
+        fs = [check_factor(fct) for fct in fs]
+        unified = union_factors(fs)
+        ends = np.cumsum([len(fct) for fct in fs])
+        return [
+            Categorical.from_codes(
+                codes,
+                categories=unified.categories,
+                ordered=bool(is_ordered(fct, **meta_kwargs)),
+            )
+            for fct, codes in zip(fs, np.split(unified.codes, ends[:-1]))
+        ]
 
     out = []
     for fct in fs:
@@ -20,21 +20,42 @@ from datar.apis.forcats import (
 )
 
 from ... import pandas as pd
-from ...pandas import Categorical, DataFrame, Series, SeriesGroupBy, get_obj
+from ...pandas import (
+    Categorical,
+    Index,
+    Series,
+    SeriesGroupBy,
+    get_obj,
+    is_bool_dtype,
+    is_numeric_dtype,
+)
 from ...common import is_scalar, intersect, setdiff
 from ...collections import Collection
 from ...contexts import Context
-from ...utils import get_grouper
-from ..base.arithm import median
+from ...utils import get_grouper, split_offsets
+from ..base.arithm import max_, mean, median, min_
 from ..base.asis import as_integer
 from ..base.factor import levels, nlevels
-from ..base.seq import seq_len, sample, rev, match, append, order
+from ..base.seq import seq_len, sample, rev, append, order
 from ..base.table import table
 from ..base.verbs import duplicated
 from .utils import check_factor, ForcatsRegType
 from .lvls import lvls_seq
 
 
+# The summary functions for fct_reorder() done by groupby aggregations
+_LEVEL_REDUCERS = {
+    median: "median",
+    np.median: "median",
+    mean: "mean",
+    np.mean: "mean",
+    max_: "max",
+    np.max: "max",
+    min_: "min",
+    np.min: "min",
+}
+
+
 def _safe_level_dtype(dtype):
     """Return dtype if numpy-compatible, else object (for pandas extension dtypes)"""
     try:
@@ -44,6 +65,23 @@ def _safe_level_dtype(dtype):
         return object
 
 
+def _summarise_levels(codes, nlvls, summarise):
+    """Summarise the rows of each level, NA for the levels not used, as
+    `tapply()` does
+    """
+    rows, offsets = split_offsets(codes, nlvls)
+    summary = [np.nan] * nlvls
+    for i in range(nlvls):
+        if offsets[i] == offsets[i + 1]:
+            continue
+
+        summary[i] = summarise(rows[offsets[i] : offsets[i + 1]])
+        if not is_scalar(summary[i]):
+            raise ValueError("`fun` must return a single value per group.")
+
+    return Series(summary)
+
+
 @fct_relevel.register(ForcatsRegType, context=Context.EVAL, backend="pandas")
 def _fct_relevel(
     _f,
@@ -94,12 +132,8 @@ def _fct_relevel(
 
     return lvls_reorder(
         _f,
-        match(
-            new_levels,
-            old_levels,
-            __ast_fallback="normal",  # type: ignore
-            __backend="numpy",  # type: ignore
-        ),
+        # levels are unique, and looked up by hashing
+        Index(old_levels).get_indexer(new_levels),
         __ast_fallback="normal",  # type: ignore
         __backend="pandas",  # type: ignore
     )
@@ -295,26 +329,42 @@ def _fct_reorder(
     if len(_f) != len(_x):
         raise ValueError("Unmatched length between `_x` and `_f`.")
 
-    summary = DataFrame({"f": _f, "x": _x}).groupby(
-        "f", observed=False, sort=False, dropna=False
-    )
+    codes = Categorical(_f).codes
+    nlvls = len(levels(_f, __ast_fallback="normal", __backend="pandas"))
+    _x = _x.reset_index(drop=True) if isinstance(_x, Series) else Series(_x)
     args = args[1:]
-    if getattr(_fun, "_pipda_functype", None) in ("pipeable", "verb"):
-        # simulate tapply
-        # TODO: test
-        summary = summary.agg(  # pragma: no cover
-            lambda col: _fun(col, *args, **kwargs, __ast_fallback="normal")
+    reducer = _LEVEL_REDUCERS.get(_fun)
+    if (
+        reducer is not None
+        and not args
+        and not kwargs
+        and is_numeric_dtype(_x)
+        and not is_bool_dtype(_x)
+    ):
+        valid = codes >= 0
+        summary = (
+            _x[valid].groupby(codes[valid]).agg(reducer).reindex(range(nlvls))
         )
+        if reducer == "median":
+            # np.median() does not skip the NAs
+            with_na = np.bincount(codes[valid & _x.isna().values], minlength=nlvls)
+            summary[with_na > 0] = np.nan
     else:
-        summary = summary.agg(lambda col: _fun(col, *args, **kwargs))
-
-    if not is_scalar(summary.iloc[0, 0]):
-        raise ValueError("`fun` must return a single value per group.")
+        if getattr(_fun, "_pipda_functype", None) in (
+            "pipeable",
+            "verb",
+        ):  # pragma: no cover
+            kwargs["__ast_fallback"] = "normal"
+        summary = _summarise_levels(
+            codes,
+            nlvls,
+            lambda rows: _fun(_x.take(rows), *args, **kwargs),
+        )
 
     return lvls_reorder(
         _f,
         order(
-            summary.iloc[:, 0],
+            summary,
             decreasing=_desc,
             __ast_fallback="normal",  # type: ignore
             __backend="numpy",  # type: ignore
@@ -356,28 +406,48 @@ def _fct_reorder2(
     if len(_f) != len(_x) or len(_f) != len(_y):
         raise ValueError("Unmatched length between `_x` and `_f`.")
 
-    summary = DataFrame({"f": _f, "x": _x, "y": _y}).groupby(
-        "f", observed=False, sort=False, dropna=False
-    )
+    codes = Categorical(_f).codes
+    nlvls = len(levels(_f, __ast_fallback="normal", __backend="pandas"))
+    _x = _x.reset_index(drop=True) if isinstance(_x, Series) else Series(_x)
+    _y = _y.reset_index(drop=True) if isinstance(_y, Series) else Series(_y)
     args = args[1:]
 
-    if getattr(_fun, "_pipda_functype", None) in (
-        "pipeable",
-        "verb",
-    ):  # pragma: no cover
-        kwargs["__ast_fallback"] = "normal"
-
-    summary = summary.apply(
-        lambda row: _fun(
-            row.x.reset_index(drop=True),
-            row.y.reset_index(drop=True),
-            *args,
-            **kwargs,
+    if (
+        (_fun is last2 or _fun is first2)
+        and not args
+        and not kwargs
+        and is_numeric_dtype(_x)
+    ):
+        # sort the rows by the levels and then _x, as order() does for
+        # last2() with NAs first and for first2() with NAs last
+        na = -np.inf if _fun is last2 else np.inf
+        key = np.where(_x.isna(), na, _x.to_numpy(dtype=float, na_value=np.nan))
+        rows = np.lexsort((key, codes))
+        counts = np.bincount(codes[codes >= 0], minlength=nlvls)
+        ends = np.cumsum(counts) + rows.size - counts.sum()
+        picked = ends - 1 if _fun is last2 else ends - counts
+        used = counts > 0
+        summary = (
+            _y.take(rows[picked[used]])
+            .set_axis(np.flatnonzero(used))
+            .reindex(range(nlvls))
+        )
+    else:
+        if getattr(_fun, "_pipda_functype", None) in (
+            "pipeable",
+            "verb",
+        ):  # pragma: no cover
+            kwargs["__ast_fallback"] = "normal"
+        summary = _summarise_levels(
+            codes,
+            nlvls,
+            lambda rows: _fun(
+                _x.take(rows).reset_index(drop=True),
+                _y.take(rows).reset_index(drop=True),
+                *args,
+                **kwargs,
+            ),
         )
-    )
-
-    if not isinstance(summary, Series) or not is_scalar(summary.values[0]):
-        raise ValueError("`fun` must return a single value per group.")
 
     return lvls_reorder(
         _f,
@@ -22,13 +22,12 @@ from datar.apis.forcats import (
 
 from ... import pandas as pd
 from ...utils import meta_kwargs
-from ...pandas import Categorical, DataFrame
+from ...pandas import Categorical, Index
 from ...contexts import Context
 from ..base.factor import levels, nlevels
 from ..base.funs import rank
-from ..base.seq import match, sample, order
+from ..base.seq import sample, order
 from ..base.string import paste0
-from ..base.table import table
 from ..dplyr.recode import recode_factor
 from ..dplyr.if_else import if_else
 from .utils import check_factor, ForcatsRegType
@@ -66,11 +65,8 @@ def _fct_anon(
     )
     return lvls_reorder(
         _f,
-        match(
-            lvls,
-            levels(_f, **meta_kwargs),
-            **meta_np,
-        ),
+        # levels are unique, and looked up by hashing
+        Index(levels(_f, **meta_kwargs)).get_indexer(lvls),
     )
 
 
@@ -250,7 +246,7 @@ def _fct_lump_prop(
             **meta_kwargs,
         )
 
-    if prop > 0 and sum(prop_n <= prop) <= 1:
+    if prop > 0 and np.sum(prop_n <= prop) <= 1:
         return _f
 
     if other_level in new_levels:
@@ -309,7 +305,7 @@ def _fct_lump_n(
         **meta_kwargs,
     )
 
-    if sum(rnk > n) <= 1:
+    if np.sum(rnk > n) <= 1:
         return _f
 
     if other_level in new_levels:
@@ -489,11 +485,14 @@ def check_weights(w, n: Optional[int] = None):
             f"`w` must be the same length as `f` ({n}), not length {len(w)}."
         )
 
-    for weight in w:
-        if weight < 0 or pd.isnull(weight):
-            raise ValueError(
-                f"All `w` must be non-negative and non-missing, got {weight}."
-            )
+    weights = np.asarray(w)
+    invalid = pd.isnull(weights)
+    invalid[~invalid] = weights[~invalid] < 0
+    if invalid.any():
+        raise ValueError(
+            "All `w` must be non-negative and non-missing, "
+            f"got {weights[invalid.argmax()]}."
+        )
 
     return w
 
@@ -503,18 +502,16 @@ def check_calc_levels(_f, w=None):
     _f = check_factor(_f)
     w = check_weights(w, len(_f))
 
+    codes = Categorical(_f).codes
+    nlvls = nlevels(_f, **meta_kwargs)
+    valid = codes >= 0
     if w is None:
-        cnt = table(_f).iloc[0, :].values
+        cnt = np.bincount(codes[valid], minlength=nlvls)
         total = len(_f)
     else:
-        cnt = (
-            DataFrame({"w": w, "f": _f})
-            .groupby("f", observed=False, sort=False, dropna=True)
-            .agg("sum")
-            .iloc[:, 0]
-            .values
-        )
-        total = sum(w)
+        w = np.asarray(w)
+        cnt = np.bincount(codes[valid], weights=w[valid], minlength=nlvls)
+        total = w.sum()
 
     return {"_f": _f, "count": cnt, "total": total}
 
@@ -523,16 +520,10 @@ def lump_cutoff(x) -> int:
     """Lump together smallest groups, ensuring that the collective
     "other" is still the smallest group. Assumes x is vector
     of counts in descending order"""
-    left = sum(x)
-
-    for i, elem in enumerate(x):
-        # After group, there are this many left
-        left -= elem
-
-        if elem > left:
-            return i + 1
-
-    return len(x)  # pragma: no cover
+    # After each group, there are this many left
+    left = np.sum(x) - np.cumsum(x)
+    cutoff = np.flatnonzero(x > left)
+    return cutoff[0] + 1 if cutoff.size > 0 else len(x)
 
 
 def in_smallest(x) -> Any:
@@ -10,15 +10,15 @@ from datar.apis.forcats import (
     lvls_expand,
 )
 
-from ...pandas import Categorical
+from ... import pandas as pd
+from ...pandas import Categorical, Index
 from ...contexts import Context
-from ...common import is_integer, setdiff, union, unique
-from ..base.asis import as_character, as_integer, is_ordered
+from ...common import is_integer, setdiff, unique
+from ..base.asis import is_ordered
 from ..base.factor import levels, nlevels, factor
-from ..base.seq import match, seq_along
-from ..dplyr.recode import recode_factor
+from ..base.seq import seq_along
 from ..dplyr.sets import setequal
-from .utils import check_factor, ForcatsRegType
+from .utils import check_factor, union_factors, ForcatsRegType
 
 
 meta_pd = cast(Any, {"__ast_fallback": "normal", "__backend": "pandas"})
@@ -113,33 +113,17 @@ def _lvls_revalue(
             f"new levels, got {len(new_levels)}.",
         )
 
+    # the levels are remapped on the codes, with the unused levels kept
     u_levels = unique(new_levels)
-    if len(new_levels) > len(u_levels):
-        # has duplicates
-        index = match(
-            new_levels,
-            u_levels,
-            **meta_np,
-        )
-        out = factor(
-            as_character(index[as_integer(_f, **meta_pd)]),
-            **meta_pd,
-        )
-        return recode_factor(
-            out,
-            dict(
-                zip(
-                    levels(out, **meta_pd),
-                    u_levels,
-                )
-            ),
-            **meta_pd,
-        ).values
-
-    recodings = dict(
-        zip(levels(_f, **meta_pd), new_levels)
+    u_levels = u_levels[pd.notnull(u_levels)]
+    index = Index(u_levels).get_indexer(new_levels)
+    # code -1 (NA) takes the -1 appended
+    codes = np.append(index, -1)[Categorical(_f).codes]
+    return Categorical.from_codes(
+        codes,
+        categories=u_levels,
+        ordered=bool(is_ordered(_f, **meta_pd)),
     )
-    return recode_factor(_f, recodings, **meta_pd).values
 
 
 @lvls_expand.register(ForcatsRegType, context=Context.EVAL, backend="pandas")
@@ -180,9 +164,4 @@ def _lvls_union(
     Returns:
         A list of all levels
     """
-    out = []
-    for fct in fs:
-        fct = check_factor(fct)
-        levs = levels(fct, **meta_pd)
-        out = union(out, levs)
-    return out
+    return union_factors(fs).categories.to_numpy()
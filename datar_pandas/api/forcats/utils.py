@@ -3,7 +3,13 @@
 import numpy as np
 
 from ...common import is_scalar, is_factor
-from ...pandas import Categorical, Series, Index, SeriesGroupBy
+from ...pandas import (
+    Categorical,
+    Series,
+    Index,
+    SeriesGroupBy,
+    union_categoricals,
+)
 
 
 ForcatsRegType = (
@@ -25,3 +31,27 @@ def check_factor(_f) -> Categorical:
         return Categorical(_f)
 
     return _f
+
+
+def union_factors(fs) -> Categorical:
+    """Concatenate factors, with the levels unified in order of appearance
+
+    The codes of each factor are remapped to the union of the levels by
+    a single `union_categoricals()`, instead of matching the values.
+    """
+    fs = [Categorical(check_factor(fct)) for fct in fs]
+    if not fs:
+        return Categorical([])
+
+    try:
+        return union_categoricals(fs, ignore_order=True)
+    except TypeError:
+        # levels with different dtypes, i.e. int and str
+        fs = [
+            Categorical.from_codes(
+                fct.codes,
+                categories=fct.categories.astype(object),
+            )
+            for fct in fs
+        ]
+        return union_categoricals(fs, ignore_order=True)
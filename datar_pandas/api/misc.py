@@ -3,14 +3,16 @@
 
 import warnings
 
+import numpy as np
 from pipda import register_verb, register_func
 from datar.apis.misc import array_ufunc
 from datar_numpy.utils import make_array
 
-from ..pandas import DataFrame, Series, PandasObject, SeriesGroupBy
+from ..pandas import DataFrame, Series, PandasObject, SeriesGroupBy, get_obj
 from ..contexts import Context
-from ..utils import as_series, get_grouper
-from ..tibble import Tibble
+from ..factory import _with_hooks, func_factory
+from ..broadcast import _grouper_compatible
+from ..utils import as_series, get_grouper, group_codes, split_offsets
 from ..collections import Collection
 
 
@@ -36,43 +38,86 @@ def itemgetter(x, subscr):
     return x[make_array(subscr)]
 
 
+def _check_positions(pos: np.ndarray, sizes) -> np.ndarray:
+    """Turn negative positions into the ones from the start, and check
+    if they are out of bounds of the sizes"""
+    pos = np.where(pos < 0, pos + sizes, pos)
+    if ((pos < 0) | (pos >= sizes)).any():
+        raise IndexError("positional indexers are out-of-bounds")
+    return pos
+
+
+def _getitem_in_groups(x: SeriesGroupBy, subscr):
+    """Get the items at the positions of subscr from each group of x
+
+    The items are gathered at once from the rows of the groups put together,
+    with the offsets of the groups plus the positions in them.
+    """
+    grouper = get_grouper(x)
+    obj = get_obj(x)
+    order, offsets = split_offsets(grouper.codes_info, grouper.ngroups)
+    sizes = np.diff(offsets)
+
+    if isinstance(subscr, SeriesGroupBy):
+        if not _grouper_compatible(
+            grouper,
+            get_grouper(subscr),
+            broadcastable=False,
+        ):
+            raise ValueError("Grouping of x and subscr are not compatible")
+        codes = group_codes(subscr, grouper.result_index)
+        gids = codes[codes >= 0]
+        pos = get_obj(subscr).to_numpy()[codes >= 0].astype(int)
+        gids_order = np.argsort(gids, kind="stable")
+        gids, pos = gids[gids_order], pos[gids_order]
+        pos = _check_positions(pos, sizes[gids])
+    else:
+        # the positions depend on the size of the groups,
+        # i.e. negative ones and slices in a Collection
+        gids = []
+        pos = []
+        for size in np.unique(sizes):
+            if isinstance(subscr, Collection):
+                subscr.expand(pool=int(size))
+            spos = make_array(subscr)
+            if spos.dtype == bool:
+                if spos.size != size:
+                    raise IndexError(
+                        f"Boolean index has wrong length: {spos.size} "
+                        f"instead of {size}"
+                    )
+                spos = np.flatnonzero(spos)
+            spos = _check_positions(spos.astype(int), size)
+            sgids = np.flatnonzero(sizes == size)
+            gids.append(np.repeat(sgids, spos.size))
+            pos.append(np.tile(spos, sgids.size))
+
+        gids = np.concatenate(gids) if gids else np.array([], dtype=int)
+        pos = np.concatenate(pos) if pos else np.array([], dtype=int)
+        gids_order = np.argsort(gids, kind="stable")
+        gids, pos = gids[gids_order], pos[gids_order]
+
+    out = obj.take(order[offsets[gids] + pos])
+    out.index = grouper.result_index.take(gids)
+    return out
+
+
 @itemgetter.register(PandasObject, backend="pandas")
 def _itemgetter_pobj(x, subscr):
-    if isinstance(x, SeriesGroupBy) and isinstance(subscr, SeriesGroupBy):
-        df = Tibble.from_args(x=x, subscr=subscr)
-        return (
-            df._datar["grouped"]
-            .apply(
-                lambda subdf: itemgetter(
-                    subdf["x"],
-                    subdf["subscr"],
-                    __backend="pandas",  # type: ignore
-                    __ast_fallback="normal",  # type: ignore
-                )
-            )
-            .droplevel(-1)
-        )
-
     if isinstance(x, SeriesGroupBy):
-        return x.apply(
-            lambda ser: itemgetter(
-                ser,
-                subscr,
-                __backend="pandas",  # type: ignore
-                __ast_fallback="normal",  # type: ignore
-            )
-        ).droplevel(-1)
+        return _getitem_in_groups(x, subscr)
 
     if isinstance(x, PandasObject):
         if isinstance(subscr, SeriesGroupBy):
-            return subscr.apply(
-                lambda ser: itemgetter(
-                    x,
-                    ser,
-                    __backend="pandas",  # type: ignore
-                    __ast_fallback="normal",  # type: ignore
-                )
-            ).droplevel(-1)
+            # the items of x at the positions of each group
+            grouper = get_grouper(subscr)
+            codes = grouper.codes_info
+            rows = np.flatnonzero(codes >= 0)
+            rows = rows[np.argsort(codes[rows], kind="stable")]
+            pos = get_obj(subscr).to_numpy()[rows].astype(int)
+            out = x.take(_check_positions(pos, x.shape[0]))
+            out.index = grouper.result_index.take(codes[rows])
+            return out
 
         if isinstance(subscr, Collection):
             subscr.expand(x.shape[0])
@@ -221,6 +266,188 @@ def pd_dt(x):
     )
 
 
+def _window(x: Series, make_window, fun, args, kwargs, grouper=None, time=None):
+    """Compute a window function on the values of x, in the groups
+
+    The rows are sorted by the groups (and by `time` within them) once, so
+    that the windows of all the groups are computed by one pandas kernel, and
+    the results are put back to the rows where the values come from.
+    Rows not in any of the groups get NAs.
+    """
+    rows = np.arange(x.size)
+    if time is not None:
+        time = np.asarray(get_obj(time) if isinstance(time, SeriesGroupBy) else time)
+        rows = Series(time).sort_values(kind="stable").index.to_numpy()
+    if grouper is not None:
+        codes = grouper.codes_info
+        order, _ = split_offsets(codes[rows], grouper.ngroups)
+        rows = rows[order]
+
+    values = Series(
+        x.to_numpy()[rows],
+        index=None if time is None else time[rows],
+    )
+    if grouper is not None:
+        values = values.groupby(codes[rows])
+
+    window = make_window(values)
+    if callable(fun):
+        rolled = window.apply(fun, raw=True, args=args, kwargs=kwargs)
+    else:
+        rolled = getattr(window, fun)(*args, **kwargs)
+
+    out = np.full(x.size, np.nan)
+    out[rows] = rolled.to_numpy()
+    return Series(out, index=x.index, name=x.name)
+
+
+def _pd_rolling(
+    x,
+    window,
+    fun="mean",
+    *args,
+    time=None,
+    min_periods=None,
+    center=False,
+    win_type=None,
+    closed=None,
+    **kwargs,
+):
+    return _window(
+        as_series(x),
+        lambda values: values.rolling(
+            window,
+            min_periods=min_periods,
+            center=center,
+            win_type=win_type,
+            closed=closed,
+        ),
+        fun,
+        args,
+        kwargs,
+        time=time,
+    )
+
+
+pd_rolling = func_factory(
+    kind="transform",
+    name="pd_rolling",
+    doc="""Rolling window calculations, like `x.rolling(...).<fun>(...)` in
+    pandas, but registered as a function so that it can be used in verbs,
+    where it is computed within groups.
+
+    See https://pandas.pydata.org/docs/reference/api/pandas.Series.rolling.html
+
+    Examples:
+        >>> df >> group_by(f.g) >> mutate(y=pd_rolling(f.x, 7))
+        >>> # rolling sums over time-based windows
+        >>> df >> mutate(y=pd_rolling(f.x, "7D", "sum", time=f.date))
+
+    Args:
+        x: The values
+        window: Size of the moving window. Could be an offset (e.g. `"7D"`)
+            for time-based windows, with `time` given.
+        fun: The name of the method of the rolling object (e.g. `"mean"`,
+            `"sum"` and `"quantile"`), or a function that takes a numpy array
+            and returns a single value
+        *args: and
+        **kwargs: Other arguments passing to `fun`
+        time: The times of the values for time-based windows.
+            The values do not need to be sorted by them.
+        min_periods: Minimum number of values in a window to have a value
+        center: Whether to set the labels at the center of the window
+        win_type: The type of the window weighting
+        closed: Which endpoints of the window to exclude
+
+    Returns:
+        The values of the windows
+    """,
+    func=_pd_rolling,
+)
+
+
+@pd_rolling.register(SeriesGroupBy, backend="pandas")
+@_with_hooks(post="transform")
+def _pd_rolling_sgb(
+    x,
+    window,
+    fun="mean",
+    *args,
+    time=None,
+    min_periods=None,
+    center=False,
+    win_type=None,
+    closed=None,
+    **kwargs,
+):
+    return _window(
+        get_obj(x),
+        lambda values: values.rolling(
+            window,
+            min_periods=min_periods,
+            center=center,
+            win_type=win_type,
+            closed=closed,
+        ),
+        fun,
+        args,
+        kwargs,
+        grouper=get_grouper(x),
+        time=time,
+    )
+
+
+def _pd_expanding(x, fun="mean", *args, min_periods=1, **kwargs):
+    return _window(
+        as_series(x),
+        lambda values: values.expanding(min_periods=min_periods),
+        fun,
+        args,
+        kwargs,
+    )
+
+
+pd_expanding = func_factory(
+    kind="transform",
+    name="pd_expanding",
+    doc="""Expanding window calculations, like `x.expanding(...).<fun>(...)`
+    in pandas, but registered as a function so that it can be used in verbs,
+    where it is computed within groups.
+
+    See https://pandas.pydata.org/docs/reference/api/pandas.Series.expanding.html
+
+    Examples:
+        >>> df >> group_by(f.g) >> mutate(y=pd_expanding(f.x, "quantile", 0.9))
+
+    Args:
+        x: The values
+        fun: The name of the method of the expanding object (e.g. `"mean"`,
+            `"sum"` and `"quantile"`), or a function that takes a numpy array
+            and returns a single value
+        *args: and
+        **kwargs: Other arguments passing to `fun`
+        min_periods: Minimum number of values in a window to have a value
+
+    Returns:
+        The values of the windows
+    """,
+    func=_pd_expanding,
+)
+
+
+@pd_expanding.register(SeriesGroupBy, backend="pandas")
+@_with_hooks(post="transform")
+def _pd_expanding_sgb(x, fun="mean", *args, min_periods=1, **kwargs):
+    return _window(
+        get_obj(x),
+        lambda values: values.expanding(min_periods=min_periods),
+        fun,
+        args,
+        kwargs,
+        grouper=get_grouper(x),
+    )
+
+
 @register_verb(DataFrame)
 def flatten(_data: DataFrame, bycol: bool = False):
     """Flatten a dataframe into a 1-d python list
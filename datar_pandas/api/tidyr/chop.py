@@ -12,7 +12,13 @@ from datar.apis.tidyr import drop_na, chop, unchop
 from ... import pandas as pd
 from ...pandas import DataFrame, Series
 from ...common import is_scalar, union, setdiff
-from ...utils import vars_select, apply_dtypes, meta_kwargs
+from ...utils import (
+    vars_select,
+    apply_dtypes,
+    get_grouper,
+    meta_kwargs,
+    split_offsets,
+)
 from ...contexts import Context
 from ...tibble import reconstruct_tibble
 from ..dplyr.group_by import ungroup
@@ -65,19 +71,33 @@ def _chop(
     key_cols = setdiff(all_columns, cols) if cols.size > 0 else all_columns
     ungrouped = ungroup(data, **meta_pd)
     if key_cols.size == 0:
-        grouped = ungrouped.groupby([1] * data.shape[0], sort=False)
-        out = grouped.agg(list).reset_index(drop=True)
+        codes = np.zeros(data.shape[0], dtype=np.intp)
+        ngroups = int(data.shape[0] > 0)
     else:
-        grouped = ungroup(
-            data,
-            **meta_pd,
-        ).groupby(
-            list(key_cols),
-            dropna=False,
-            observed=True,
-            sort=False,
+        grouper = get_grouper(
+            ungrouped.groupby(
+                list(key_cols),
+                dropna=False,
+                observed=True,
+                sort=False,
+            )
         )
-        out = grouped.agg(list).reset_index()
+        codes, ngroups = grouper.codes_info, grouper.ngroups
+
+    # chop the values of the sorted rows by the offsets of the groups
+    order, offsets = split_offsets(codes, ngroups)
+    out = ungrouped[key_cols].take(order[offsets[:-1]]).reset_index(drop=True)
+    for col in all_columns[all_columns.isin(cols)]:
+        values = ungrouped[col].take(order)
+        if ngroups == 0:
+            # keep the dtype
+            out[col] = values.reset_index(drop=True)
+            continue
+        values = values.tolist()
+        out[col] = [
+            values[start:end] for start, end in zip(offsets[:-1], offsets[1:])
+        ]
+
     return reconstruct_tibble(out, data)
 
 
@@ -3,18 +3,24 @@
 https://github.com/tidyverse/tidyr/blob/HEAD/R/expand.R
 """
 
-from typing import Any, Callable, Iterable, Mapping, Union, cast
+from typing import Any, Callable, Iterable, Mapping, Optional, Union, cast
 
 import numpy as np
 
 from datar.core.names import repair_names
+from pipda.reference import Reference
 from datar.apis.tidyr import expand, expand_grid, nesting, crossing
 
 from ... import pandas as pd
 from ...pandas import DataFrame, Series, Categorical
 from ...common import is_scalar, unique
 from ...contexts import Context
-from ...utils import DEFAULT_COLUMN_PREFIX, meta_kwargs
+from ...utils import (
+    DEFAULT_COLUMN_PREFIX,
+    get_grouper,
+    meta_kwargs,
+    split_offsets,
+)
 from ...tibble import Tibble, TibbleGrouped, TibbleRowwise, reconstruct_tibble
 from ..base.factor import factor, levels
 from ..dplyr.arrange import arrange
@@ -134,6 +140,9 @@ def _expand_grouped(
     **kwargs: Union[Series, DataFrame],
 ) -> DataFrame:
     """Expand on grouped data frame"""
+    out = _expand_grouped_columns(data, args, kwargs, _name_repair)
+    if out is not None:
+        return reconstruct_tibble(out, data)
 
     def apply_func(df):
         return expand(
@@ -279,6 +288,96 @@ def _dots_cols(
     return out
 
 
+def _expand_grouped_columns(
+    data: TibbleGrouped,
+    args: Iterable[Any],
+    kwargs: Mapping[str, Any],
+    name_repair: Union[str, Callable],
+) -> Optional[DataFrame]:
+    """Expand the columns within all the groups at once
+
+    The sorted unique values of each column in each group are taken with one
+    `drop_duplicates()` on the group codes and the values, and the rows of
+    the combinations of all groups are indexed together.
+
+    Returns None unless all the arguments refer to the non-grouping,
+    non-categorical columns directly, which are expanded group by group.
+    """
+    group_vars = list(data.group_vars)
+    refs = {}
+    for arg in args:
+        if arg is not None:
+            refs[getattr(arg, "_pipda_ref", None)] = arg
+    refs.update({name: arg for name, arg in kwargs.items() if arg is not None})
+    for arg in refs.values():
+        if not (
+            isinstance(arg, Reference)
+            and arg._pipda_level == 1
+            and arg._pipda_ref in data.columns
+            and arg._pipda_ref not in group_vars
+            and not pd.is_categorical_dtype(data[arg._pipda_ref].obj)
+        ):
+            return None
+
+    if not refs:
+        return None
+
+    ungrouped = ungroup(data, **meta_pd)
+    grouper = get_grouper(data._datar["grouped"])
+    codes, ngroups = grouper.codes_info, grouper.ngroups
+    order, offsets = split_offsets(codes, ngroups)
+    # groups that have rows
+    groups = np.flatnonzero(np.diff(offsets))
+    present = codes >= 0
+
+    values = []
+    sizes = []
+    starts = []
+    for arg in refs.values():
+        uniq = DataFrame(
+            {"g": codes[present], "v": ungrouped[arg._pipda_ref][present]}
+        )
+        try:
+            uniq = uniq.drop_duplicates().sort_values(
+                ["g", "v"],
+                na_position="last",
+                kind="stable",
+            )
+        except TypeError:
+            # unhashable or not comparable
+            return None
+
+        size = np.bincount(uniq["g"], minlength=ngroups)[groups]
+        uniq = uniq["v"].reset_index(drop=True)
+        if uniq.dtype == object:
+            # like _sorted_unique(), NAs as NaN
+            uniq = uniq.where(uniq.notna(), np.nan)
+        values.append(uniq)
+        sizes.append(size)
+        starts.append(np.cumsum(size) - size)
+
+    # combinations in each group, the first column varies the slowest
+    totals = np.prod(sizes, axis=0)
+    each = np.cumprod([np.ones_like(totals)] + sizes[:0:-1], axis=0)[::-1]
+    rowgroups = np.repeat(np.arange(groups.size), totals)
+    rowpos = np.arange(rowgroups.size) - np.repeat(
+        np.cumsum(totals) - totals,
+        totals,
+    )
+
+    out = (
+        ungrouped[group_vars]
+        .take(order[offsets[groups]][rowgroups])
+        .reset_index(drop=True)
+    )
+    names = repair_names(list(refs), name_repair)
+    for name, vals, size, start, rep in zip(names, values, sizes, starts, each):
+        idx = start[rowgroups] + rowpos // rep[rowgroups] % size[rowgroups]
+        out[name] = vals.take(idx).reset_index(drop=True)
+
+    return out
+
+
 def _vec_repeat(
     vec: Iterable[Any], each: int, times: int
 ) -> Iterable[Any]:
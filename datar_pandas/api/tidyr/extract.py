@@ -82,7 +82,9 @@ def _extract(
         outcol: (
             out.iloc[:, indexes[0]]
             if len(indexes) == 1
-            else out.iloc[:, indexes].astype(str).agg("".join, axis=1)
+            else out.iloc[:, indexes[0]].str.cat(
+                [out.iloc[:, i] for i in indexes[1:]]
+            )
         )
         for outcol, indexes in mergedcols.items()
     }
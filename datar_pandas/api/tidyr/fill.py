@@ -8,8 +8,9 @@ from datar.apis.tidyr import fill
 
 from ...pandas import DataFrame
 from ...contexts import Context
-from ...utils import vars_select, meta_kwargs
+from ...utils import get_grouper, vars_select, meta_kwargs
 from ...tibble import TibbleGrouped, reconstruct_tibble
+from ..dplyr.group_by import ungroup
 
 
 meta_pd = cast(Any, meta_kwargs)
@@ -65,31 +66,22 @@ def _fill_grouped(
     *columns: str,
     _direction: str = "down",
 ) -> DataFrame:
-    # Use transform instead of apply to avoid include_groups issue in pandas 3
-    data = _data.copy()
+    data = ungroup(_data, **meta_pd).copy()
     if not columns:  # pragma: no cover
         colidx = list(range(len(_data.columns)))
     else:
         colidx = vars_select(_data.columns, *columns)
     cols = list(_data.columns[colidx])
-    grouped = _data._datar["grouped"]
-    group_vars = list(_data.group_vars)
+    # fill all the columns at once by the group codes
+    codes = get_grouper(_data._datar["grouped"]).codes_info
 
-    for col in cols:
-        sgb = grouped[col]
-        if _direction.startswith("down"):
-            data[col] = sgb.transform(lambda g: g.ffill())
-        else:  # pragma: no cover
-            data[col] = sgb.transform(lambda g: g.bfill())
-
-        if len(_direction) > 4:  # pragma: no cover
-            # Second pass with re-grouped data
-            sgb2 = data[col].groupby(
-                cast(Any, data[group_vars] if group_vars else data.index)
-            )
-            if _direction.endswith("down"):
-                data[col] = sgb2.transform(lambda g: g.ffill())
-            else:
-                data[col] = sgb2.transform(lambda g: g.bfill())
+    first = "down" if _direction.startswith("down") else "up"
+    directions = [first, _direction[len(first):]] if _direction != first else [first]
+
+    filled = data[cols]
+    for direction in directions:
+        grouped = filled.groupby(codes, sort=False)
+        filled = grouped.ffill() if direction == "down" else grouped.bfill()
 
+    data[cols] = filled
     return reconstruct_tibble(data, _data)
@@ -4,7 +4,18 @@ https://github.com/tidyverse/tidyr/blob/master/R/nest.R
 """
 
 import re
-from typing import Any, Callable, Mapping, Union, Iterable, List, Optional, cast
+from itertools import chain
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+)
 
 import numpy as np
 from datar.apis.tidyr import unpack, unchop, nest, unnest
@@ -12,7 +23,13 @@ from datar.apis.tidyr import unpack, unchop, nest, unnest
 from ... import pandas as pd
 from ...pandas import DataFrame, Series, NDFrame
 from ...common import is_scalar, setdiff
-from ...utils import vars_select, meta_kwargs
+from ...utils import (
+    apply_dtypes,
+    get_grouper,
+    meta_kwargs,
+    split_offsets,
+    vars_select,
+)
 from ...broadcast import broadcast_to, init_tibble_from
 from ...contexts import Context
 from ...tibble import (
@@ -23,8 +40,7 @@ from ...tibble import (
 )
 from ..dplyr.distinct import distinct
 from ..dplyr.bind import bind_cols
-from ..dplyr.group_data import group_data, group_vars
-from ..dplyr.arrange import arrange
+from ..dplyr.group_data import group_vars
 from ..dplyr.group_by import ungroup
 
 
@@ -173,17 +189,21 @@ def _unnest(
     selected_cols = all_columns[selected_cols]
 
     out = ungroup(data, **meta_pd)
-
-    for col in selected_cols:
-        out[col] = _as_df(data[col])
-
-    out = unchop(
-        out,
-        selected_cols,
-        keep_empty=keep_empty,
-        dtypes=dtypes,
-        **meta_pd,
-    )
+    unnested = _unnest_fast(out, selected_cols, keep_empty)
+    if unnested is not None:
+        out = unnested
+        apply_dtypes(out, dtypes)
+    else:
+        for col in selected_cols:
+            out[col] = _as_df(data[col])
+
+        out = unchop(
+            out,
+            selected_cols,
+            keep_empty=keep_empty,
+            dtypes=dtypes,
+            **meta_pd,
+        )
     out = unpack(
         out,
         selected_cols,
@@ -238,6 +258,154 @@ def _strip_names(names: Iterable[str], base: str, sep: str) -> List[str]:
     return out
 
 
+def _unnest_cells(series: Series) -> Optional[Tuple[np.ndarray, Any]]:
+    """Detect the kind of a list-column with one pass over the cells and
+    collect the values of the cells together
+
+    Returns:
+        The sizes of the cells (0 for null or empty cells) and the values,
+        which is a data frame concatenated from the cells if they are all
+        data frames, or an object array of the elements otherwise, with
+        an extra NA at the end.
+        None if the cells are neither all data frames nor all vectors or
+        scalars.
+    """
+    cells = series.to_numpy(dtype=object)
+    name = series.name
+    if all(
+        isinstance(cell, DataFrame) or (is_scalar(cell) and pd.isnull(cell))
+        for cell in cells
+    ):
+        frames = [cell for cell in cells if isinstance(cell, DataFrame)]
+        sizes = np.fromiter(
+            (
+                cell.shape[0] if isinstance(cell, DataFrame) and cell.shape[1] else 0
+                for cell in cells
+            ),
+            dtype=np.intp,
+            count=cells.size,
+        )
+        columns = list(dict.fromkeys(col for frame in frames for col in frame))
+        frames = [frame for frame in frames if frame.size > 0]
+        values = (
+            pd.concat(frames, ignore_index=True, sort=False).reindex(
+                columns=columns
+            )
+            if frames
+            else DataFrame(columns=columns)
+        )
+        values.columns = [f"{name}${col}" for col in columns]
+        return sizes, values
+
+    vector_types = (list, tuple, np.ndarray)
+    if not all(
+        isinstance(cell, vector_types) or is_scalar(cell) for cell in cells
+    ):
+        return None
+
+    sizes = np.fromiter(
+        (
+            len(cell)
+            if isinstance(cell, vector_types)
+            else int(not pd.isnull(cell))
+            for cell in cells
+        ),
+        dtype=np.intp,
+        count=cells.size,
+    )
+    values = np.fromiter(
+        chain(
+            chain.from_iterable(
+                cell if isinstance(cell, vector_types) else (cell,)
+                for cell, size in zip(cells, sizes)
+                if size > 0
+            ),
+            (np.nan,),
+        ),
+        dtype=object,
+        count=sizes.sum() + 1,
+    )
+    return sizes, values
+
+
+def _unnest_fast(
+    data: DataFrame,
+    cols: Iterable[str],
+    keep_empty: bool,
+) -> Optional[DataFrame]:
+    """Unnest the columns with the values of the cells collected at once
+
+    Size-1 cells are recycled. Null and empty cells give a row of NAs.
+
+    Returns:
+        The data frame with the unnested columns as df-columns (`col$a`),
+        or None if the cells of any column need to go through `_as_df()`.
+    """
+    if data.shape[0] == 0:
+        return None
+
+    cells = {}
+    for col in cols:
+        unnested = _unnest_cells(data[col])
+        if unnested is None:
+            return None
+        cells[col] = unnested
+
+    sizes = None
+    for cursizes, _ in cells.values():
+        cursizes = np.maximum(cursizes, 1)
+        if sizes is None:
+            sizes = cursizes
+            continue
+
+        bad = (sizes != cursizes) & (sizes != 1) & (cursizes != 1)
+        if bad.any():
+            i = bad.argmax()
+            raise ValueError(f"Incompatible lengths: {sizes[i]}, {cursizes[i]}.")
+        sizes = np.maximum(sizes, cursizes)
+
+    assert sizes is not None
+    rows = np.repeat(np.arange(data.shape[0]), sizes)
+    within = np.arange(rows.size) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    positions = {}
+    allna = np.ones(rows.size, dtype=bool)
+    for col, (cursizes, values) in cells.items():
+        pos = np.repeat(np.cumsum(cursizes) - cursizes, sizes)
+        cursizes = cursizes[rows]
+        # size-1 cells are recycled
+        pos += np.where(cursizes == sizes[rows], within, 0)
+        # missing values, the NA at the end of the vector values
+        pos[cursizes == 0] = -1
+        positions[col] = pos
+
+        isna = (
+            values.isna().all(axis=1).to_numpy()
+            if isinstance(values, DataFrame)
+            else pd.isnull(values[:-1])
+        )
+        allna &= np.append(isna, True)[pos]
+
+    if not keep_empty:
+        kept = ~allna
+        rows = rows[kept]
+        positions = {col: pos[kept] for col, pos in positions.items()}
+
+    out = {}
+    for col in data.columns:
+        if col not in cells:
+            out[col] = data[col].take(rows).reset_index(drop=True)
+            continue
+
+        values = cells[col][1]
+        if isinstance(values, DataFrame):
+            values = values.reindex(positions[col]).reset_index(drop=True)
+            out.update(values.items())
+        else:
+            out[f"{col}${col}"] = Series(values[positions[col]].tolist())
+
+    return DataFrame(out)
+
+
 def _as_df(series: Series) -> List[DataFrame]:
     """Convert series to dataframe"""
     out = []
@@ -269,21 +437,28 @@ def _vec_split(x: NDFrame, by: NDFrame) -> DataFrame:
     x = cast(DataFrame, x)
     by = cast(DataFrame, by)
 
-    df = bind_cols(x, by, **meta_pd)
-    if df.shape[0] == 0:
+    if x.shape[0] == 0:
         return Tibble(columns=["key", "val"])
     if by.shape[1] > 0:
-        if not isinstance(df, Tibble):  # pragma: no cover
-            df = Tibble(df, copy=False)
-        df = df.group_by(by.columns.tolist(), drop=True)
-
-    gdata = group_data(df, **meta_pd)
-    gdata = arrange(
-        gdata,
-        gdata._rows,
-        **meta_pd,
-    )
-    out = Tibble(index=gdata.index)
-    out["key"] = gdata[by.columns]
-    out["val"] = [x.iloc[rows, :].reset_index(drop=True) for rows in gdata._rows]
+        grouper = get_grouper(
+            by.groupby(
+                by.columns.tolist(),
+                observed=True,
+                sort=False,
+                dropna=False,
+            )
+        )
+        codes, ngroups = grouper.codes_info, grouper.ngroups
+    else:
+        codes, ngroups = np.zeros(x.shape[0], dtype=np.intp), 1
+
+    # groups are slices of the sorted rows, in the order of appearance
+    order, offsets = split_offsets(codes, ngroups)
+    x = x.take(order)
+    out = Tibble(index=range(ngroups))
+    out["key"] = by.take(order[offsets[:-1]]).reset_index(drop=True)
+    out["val"] = [
+        x.iloc[start:end, :].reset_index(drop=True)
+        for start, end in zip(offsets[:-1], offsets[1:])
+    ]
     return out
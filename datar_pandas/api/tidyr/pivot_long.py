@@ -4,14 +4,16 @@ https://github.com/tidyverse/tidyr/blob/HEAD/R/pivot-long.R
 """
 
 import re
-from typing import Any, Mapping, Callable, Union, Optional, cast
+from typing import Any, List, Mapping, Callable, Tuple, Union, Optional, cast
+
+import numpy as np
 
 from datar.core.names import repair_names
 from datar.apis.tidyr import extract, separate, pivot_longer
 
 from ... import pandas as pd
-from ...pandas import DataFrame
-from ...common import is_scalar, setdiff, union, unique
+from ...pandas import DataFrame, Index, MultiIndex, Series, factorize, take
+from ...common import is_scalar, setdiff, union
 from ...contexts import Context
 from ...utils import DEFAULT_COLUMN_PREFIX, vars_select, apply_dtypes, meta_kwargs
 from ...tibble import reconstruct_tibble
@@ -162,6 +164,8 @@ def _pivot_longer(
         )
 
     var_name = "__tmp_names_to__" if names_pattern or names_sep else names_to[0]
+    # the columns to be molten, in the order of melt()
+    value_vars = all_columns[~all_columns.isin(id_columns)]
     ret = ret.melt(
         id_vars=id_columns,
         # Use the rest columns automatically.
@@ -170,9 +174,13 @@ def _pivot_longer(
         var_name=var_name,
         value_name=values_to,
     )
+    # Parse each distinct name only once, and broadcast the parts to the
+    # molten rows, where the names are repeated as blocks of nrow.
+    nrow = _data.shape[0]
+    names = DataFrame({var_name: value_vars})
     if names_prefix:
         names_prefix_pattern = re.compile(f"^{re.escape(names_prefix)}")
-        ret[var_name] = ret[var_name].str.replace(
+        names[var_name] = names[var_name].str.replace(
             names_prefix_pattern,
             "",
             regex=True,
@@ -182,8 +190,8 @@ def _pivot_longer(
         ret[values_to] = ret[values_to].astype("category")
 
     if names_pattern:
-        ret = extract(
-            ret,
+        names = extract(
+            names,
             var_name,
             into=names_to,
             regex=names_pattern,
@@ -191,45 +199,42 @@ def _pivot_longer(
         )
 
     if names_sep:
-        ret = separate(
-            ret,
+        names = separate(
+            names,
             var_name,
             into=names_to,
             sep=names_sep,
             **meta_pd,
         )
-    # extract/separate puts `into` last
-    ret = relocate(
-        ret,
-        values_to,
-        _after=-1,
-        **meta_pd,
-    )
 
     if ".value" in names_to:
-        names_to = setdiff(names_to, [".value"])
-        index_columns = union(id_columns, names_to)
-        names_to = setdiff(names_to, na_names_to)
-
-        # keep the order
-        value_columns = unique(ret[".value"].values)
-        ret.set_index(list(index_columns), inplace=True)
-        ret.index = list(ret.index)
-        ret2 = ret.pivot(columns=".value", values=values_to).reset_index()
-        id_data = DataFrame(ret2["index"].tolist(), columns=index_columns)
-        ret = pd.concat(
-            [
-                id_data[
-                    id_data.columns.difference(na_names_to).difference([rowid_column])
-                ],
-                ret2[value_columns],
-            ],
-            axis=1,
+        parts = list(setdiff(names_to, [".value"]))
+        index_columns = Index(union(id_columns, parts))
+        names_to = setdiff(parts, na_names_to)
+        ret, value_columns_sel = _pivot_dot_value(
+            ret,
+            names,
+            nrow,
+            id_columns=id_columns,
+            parts=parts,
+            out_columns=index_columns.difference(na_names_to).difference(
+                [rowid_column]
+            ),
+            values_to=values_to,
         )
-        value_columns_sel = list(value_columns)
     else:
         value_columns_sel = [values_to]
-        ret = ret.drop(columns=[rowid_column])
+        ret = ret.drop(columns=[rowid_column, var_name])
+        codes = np.repeat(np.arange(names.shape[0]), nrow)
+        for col in names_to:
+            ret[col] = names[col].array.take(codes)
+        # extract/separate puts `into` last
+        ret = relocate(
+            ret,
+            values_to,
+            _after=-1,
+            **meta_pd,
+        )
 
     if values_drop_na:
         ret.dropna(subset=value_columns_sel, inplace=True)
@@ -260,3 +265,64 @@ def _pivot_longer(
     ret.columns = names
 
     return reconstruct_tibble(ret, _data)
+
+
+def _pivot_dot_value(
+    molten: DataFrame,
+    names: DataFrame,
+    nrow: int,
+    id_columns: Index,
+    parts: List,
+    out_columns: Index,
+    values_to: str,
+) -> Tuple[DataFrame, List]:
+    """Put the molten values into the `.value` columns
+
+    Each row of `names` is the parsed name of a block of `nrow` values in
+    `molten`. The output has a row for each input row and each combination
+    of the other parts of the names, and the values are gathered from the
+    blocks by index arithmetic.
+
+    Returns:
+        The data frame and the names of the value columns
+    """
+    # keep the order
+    vcodes, value_columns = factorize(names[".value"])
+    if len(parts) > 0:
+        pcodes, puniques = MultiIndex.from_frame(names[parts]).factorize(
+            sort=True
+        )
+    else:
+        pcodes = np.zeros(names.shape[0], dtype=np.intp)
+        puniques = MultiIndex.from_arrays([[]])
+    nparts = max(len(puniques), 1)
+    nvalues = len(value_columns)
+
+    cells = pcodes * nvalues + vcodes
+    if np.unique(cells).size < cells.size:
+        raise ValueError("Index contains duplicate entries, cannot reshape")
+
+    # the block of the values for each part and .value, -1 for missing
+    blocks = np.full((nparts, nvalues), -1, dtype=np.intp)
+    blocks.flat[cells] = np.arange(names.shape[0])
+    indexer = blocks * nrow + np.arange(nrow)[:, None, None]
+    indexer[:, blocks < 0] = -1
+    indexer = indexer.reshape(-1, nvalues)
+
+    rows = np.repeat(np.arange(nrow), nparts)
+    out = {}
+    for col in out_columns:
+        if col in id_columns:
+            value = molten[col].array[:nrow].take(rows)
+            out[col] = Series(value, dtype=value.dtype, copy=False)
+        else:
+            level = puniques.get_level_values(parts.index(col))
+            out[col] = np.tile(level, nrow)
+
+    values = molten[values_to].array
+    for i, col in enumerate(value_columns):
+        value = take(values, indexer[:, i], allow_fill=True)
+        # keep object dtype as it is
+        out[col] = Series(value, dtype=value.dtype, copy=False)
+
+    return DataFrame(out), list(value_columns)
@@ -7,7 +7,17 @@ from datar.apis.base import identity
 from datar.apis.tidyr import pivot_wider
 
 from ... import pandas as pd
-from ...pandas import DataFrame, Index
+from ...pandas import (
+    CategoricalDtype,
+    DataFrame,
+    Index,
+    IntIndex,
+    MultiIndex,
+    SparseArray,
+    SparseDtype,
+    factorize,
+    take,
+)
 from ...common import is_scalar
 from ...contexts import Context
 from ...utils import NA_integer_, vars_select, meta_kwargs
@@ -33,6 +43,7 @@ def _pivot_wider(
     values_from="value",
     values_fill: Any = None,
     values_fn: Union[Callable, Mapping[str, Callable]] = identity,
+    _sparse: bool = False,
 ) -> DataFrame:
     """ "widens" data, increasing the number of columns and decreasing
     the number of rows.
@@ -66,6 +77,11 @@ def _pivot_wider(
             This can be a dict you want to apply different aggregations to
             different value columns.
             If not specified, will be `numpy.mean`
+        _sparse: Whether to return the value columns as sparse columns
+            (`pd.SparseDtype`), with `values_fill` (or `NaN`) as the fill
+            value. Useful when most of the cells are missing.
+            Use `df.sparse.to_coo()` to get a `scipy.sparse` matrix from the
+            value columns.
 
     Returns:
         The pivoted dataframe.
@@ -127,21 +143,55 @@ def _pivot_wider(
     else:
         ret = undata
 
-    # hold NAs in values_from columns, so that they won't be filled
-    # by values_fill
-    if values_from and ret is _data:
-        ret = _data.copy()
-    for col in values_from:
-        ret[col] = ret[col].fillna(NA_integer_)
-
-    ret = pd.pivot_table(
-        ret,
-        index=id_cols,
-        columns=names_from,
-        fill_value=values_fill,
-        values=values_from[0] if len(values_from) == 1 else values_from,
-        aggfunc=values_fn,
-    )
+    unique_ret = None
+    if values_fn is identity:
+        unique_ret = _pivot_wider_unique(
+            ret,
+            id_cols,
+            names_from,
+            values_from,
+            values_fill,
+            _sparse,
+        )
+
+    elif _sparse:
+        # aggregate the cells in the long form first, so that the sparse
+        # columns are built from the cells with values only
+        aggregated = (
+            ret.groupby(id_cols + names_from, sort=False)[values_from]
+            .agg(values_fn)
+            .reset_index()
+        )
+        if not isinstance(aggregated.columns, MultiIndex) and all(
+            col in aggregated for col in values_from
+        ):
+            unique_ret = _pivot_wider_unique(
+                aggregated,
+                id_cols,
+                names_from,
+                values_from,
+                values_fill,
+                _sparse,
+            )
+
+    if unique_ret is not None:
+        ret = unique_ret
+    else:
+        # hold NAs in values_from columns, so that they won't be filled
+        # by values_fill
+        if values_from and ret is _data:
+            ret = _data.copy()
+        for col in values_from:
+            ret[col] = ret[col].fillna(NA_integer_)
+
+        ret = pd.pivot_table(
+            ret,
+            index=id_cols,
+            columns=names_from,
+            fill_value=values_fill,
+            values=values_from[0] if len(values_from) == 1 else values_from,
+            aggfunc=values_fn,
+        )
 
     ret.columns = _flatten_column_names(
         ret.columns, names_prefix, names_sep, names_glue
@@ -154,9 +204,18 @@ def _pivot_wider(
         ret.drop(columns=[ROWID_COLUMN], inplace=True)
 
     ret.reset_index(drop=True, inplace=True)
-    # Get the original NAs back
-    for col in ret.columns.difference(id_cols):
-        ret[col] = ret[col].replace({NA_integer_: np.nan})
+    if unique_ret is None:
+        # Get the original NAs back
+        for col in ret.columns.difference(id_cols):
+            ret[col] = ret[col].replace({NA_integer_: np.nan})
+            if _sparse:
+                fill_value = np.nan if values_fill is None else values_fill
+                ret[col] = ret[col].astype(
+                    SparseDtype(
+                        _sparse_dtype(ret[col].iloc[:0].to_numpy(), fill_value),
+                        fill_value,
+                    )
+                )
 
     if names_sort:
         ret = ret.loc[:, sorted(ret.columns)]
@@ -164,6 +223,206 @@ def _pivot_wider(
     return reconstruct_tibble(ret, _data)
 
 
+def _factorize_keys(data: DataFrame, cols: List) -> Optional[tuple]:
+    """Factorize the key columns jointly, with the combinations sorted
+
+    Rows with missing values in any of the key columns get -1, as they are
+    dropped by `groupby()`.
+
+    Returns:
+        The codes of the rows and the index of the unique keys, or None if
+        the keys can't be factorized this way (categoricals, too many
+        combinations or non-sortable values).
+    """
+    combined = np.zeros(data.shape[0], dtype=np.int64)
+    missing = np.zeros(data.shape[0], dtype=bool)
+    levels = []
+    size = 1
+    for col in cols:
+        if isinstance(data[col].dtype, CategoricalDtype):
+            return None
+        try:
+            codes, uniques = factorize(data[col], sort=True)
+        except TypeError:
+            return None
+
+        size *= max(uniques.size, 1)
+        if size >= np.iinfo(np.int64).max:  # pragma: no cover
+            return None
+        missing |= codes < 0
+        combined = combined * uniques.size + codes
+        levels.append(uniques)
+
+    codes = np.full(data.shape[0], -1, dtype=np.intp)
+    codes[~missing], uniques = factorize(combined[~missing], sort=True)
+    # decode the unique combinations back into the keys
+    arrays = []
+    for level in reversed(levels):
+        arrays.append(level.take(uniques % level.size))
+        uniques = uniques // level.size
+
+    arrays.reverse()
+    if len(cols) == 1:
+        index = Index(arrays[0], name=cols[0])
+    else:
+        index = MultiIndex.from_arrays(arrays, names=cols)
+    return codes, index
+
+
+def _pivot_wider_unique(
+    data: DataFrame,
+    id_cols: List,
+    names_from: List,
+    values_from: List,
+    values_fill: Any,
+    sparse: bool = False,
+) -> Optional[DataFrame]:
+    """Pivot the data when `id_cols` + `names_from` identify the rows
+    uniquely, by scattering the values into the cells directly.
+
+    With `sparse`, the value columns are built as sparse arrays from the
+    codes, without the dense cells.
+
+    Returns:
+        A data frame like the one from `pd.pivot_table()`, with the ids as
+        index and the names as columns, or None if this doesn't apply
+        (duplicated keys, data frame columns, categorical keys, etc)
+    """
+    if any("$" in str(col) for col in values_from):
+        return None
+    try:
+        # pivot_table() sorts the value columns as well
+        values_from = sorted(values_from)
+    except TypeError:  # pragma: no cover
+        return None
+
+    if id_cols:
+        ids = _factorize_keys(data, id_cols)
+    else:
+        ids = (np.zeros(data.shape[0], dtype=np.intp), None)
+    names = _factorize_keys(data, names_from)
+    if ids is None or names is None:
+        return None
+
+    rowcodes, rowindex = ids
+    colcodes, colindex = names
+    kept = (rowcodes >= 0) & (colcodes >= 0)
+    if not kept.any():
+        return None
+
+    # ids/names only seen with missing names/ids are dropped
+    rowcodes, used = factorize(rowcodes[kept], sort=True)
+    if rowindex is not None:
+        rowindex = rowindex.take(used)
+    colcodes, used = factorize(colcodes[kept], sort=True)
+    colindex = colindex.take(used)
+    nrows = 1 if rowindex is None else rowindex.size
+    ncols = colindex.size
+
+    # positions of the values in the cells, column by column
+    cells = colcodes * nrows + rowcodes
+    if np.unique(cells).size < cells.size:
+        # duplicates, need aggregation
+        return None
+
+    fill_value = np.nan if values_fill is None else values_fill
+    out = {}
+    if sparse:
+        for col in values_from:
+            _sparse_columns(
+                out,
+                data[col].to_numpy()[kept],
+                cells,
+                nrows,
+                ncols,
+                fill_value,
+            )
+    else:
+        indexer = np.full(nrows * ncols, -1, dtype=np.intp)
+        indexer[cells] = np.flatnonzero(kept)
+        for col in values_from:
+            try:
+                values = take(
+                    data[col].array,
+                    indexer,
+                    allow_fill=True,
+                    fill_value=fill_value,
+                )
+            except (TypeError, ValueError):
+                # values_fill not compatible with the dtype
+                return None
+            for j in range(ncols):
+                out[len(out)] = values[j * nrows : (j + 1) * nrows]
+
+    if len(values_from) == 1:
+        columns = colindex
+    else:
+        columns = MultiIndex.from_arrays(
+            [
+                np.repeat(values_from, ncols),
+                *(
+                    np.tile(colindex.get_level_values(k), len(values_from))
+                    for k in range(colindex.nlevels)
+                ),
+            ],
+            names=[None, *colindex.names],
+        )
+
+    ret = DataFrame(out, index=rowindex)
+    ret.columns = columns
+    return ret
+
+
+def _sparse_columns(
+    out: dict,
+    values: np.ndarray,
+    cells: np.ndarray,
+    nrows: int,
+    ncols: int,
+    fill_value: Any,
+) -> None:
+    """Add the sparse columns of a value column to `out`
+
+    `cells` are the positions of the values in the cells, column by column
+    """
+    dtype = _sparse_dtype(values, fill_value)
+    values = values.astype(dtype, copy=False)
+
+    order = np.argsort(cells, kind="stable")
+    cells = cells[order]
+    values = values[order]
+    bounds = np.searchsorted(cells, np.arange(ncols + 1) * nrows)
+    sdtype = SparseDtype(dtype, fill_value)
+    for j in range(ncols):
+        start, end = bounds[j], bounds[j + 1]
+        positions = cells[start:end] - j * nrows
+        if IntIndex is None:  # pragma: no cover
+            dense = np.full(nrows, fill_value, dtype=dtype)
+            dense[positions] = values[start:end]
+            out[len(out)] = SparseArray(dense, dtype=sdtype)
+            continue
+
+        out[len(out)] = SparseArray(
+            values[start:end],
+            sparse_index=IntIndex(nrows, positions.astype(np.int32)),
+            dtype=sdtype,
+        )
+
+
+def _sparse_dtype(values: np.ndarray, fill_value: Any) -> np.dtype:
+    """The dtype of the values filled with `fill_value`
+
+    This is the one the dense path gets by taking the values with the fill,
+    i.e. int -> float with NaN, bool -> object with NaN or a string
+    """
+    return take(
+        values[:0],
+        np.array([-1]),
+        allow_fill=True,
+        fill_value=fill_value,
+    ).dtype
+
+
 def _flatten_column_names(
     names: Index,
     names_prefix: str,
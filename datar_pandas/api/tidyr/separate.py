@@ -5,14 +5,14 @@ https://github.com/tidyverse/tidyr/blob/HEAD/R/separate.R
 """
 
 import re
-from typing import Any, List, Union, cast
+from typing import Any, List, Optional, Union, cast
 
 import numpy as np
 from datar.core.utils import logger
 from datar.apis.tidyr import unchop, separate, separate_rows
 
 from ... import pandas as pd
-from ...pandas import DataFrame
+from ...pandas import DataFrame, Index, Series, is_string_dtype
 from ...common import is_scalar
 from ...contexts import Context
 from ...tibble import reconstruct_tibble
@@ -80,22 +80,34 @@ def _separate(
 
     colindex = [i for i, outcol in enumerate(into) if not pd.isnull(outcol)]
     non_na_elems = lambda row: [row[i] for i in colindex]
-    # series.str.split can't do extra and fill
-    # extracted = data[col].str.split(sep, expand=True).iloc[:, colindex]
     nout = len(into)
     extra_warns = []
     missing_warns = []
 
-    separated = data[col].apply(
-        _separate_col,
-        nout=nout,
-        sep=sep,
-        extra=extra,
-        fill=fill,
-        extra_warns=extra_warns,
-        missing_warns=missing_warns,
-    )
+    _data = ungroup(data, **meta_pd)
+    strs = _as_strs(_data[col])
+    if strs is None:
+        separated = _data[col].apply(
+            _separate_col,
+            nout=nout,
+            sep=sep,
+            extra=extra,
+            fill=fill,
+            extra_warns=extra_warns,
+            missing_warns=missing_warns,
+        )
+    else:
+        separated = _separate_strs(
+            strs,
+            nout=nout,
+            sep=sep,
+            extra=extra,
+            fill=fill,
+            extra_warns=extra_warns,
+            missing_warns=missing_warns,
+        )
 
+    separated = separated.tolist()
     if extra_warns:
         logger.warning(
             "Expected %s pieces. Additional pieces discarded in %s rows %s.",
@@ -111,11 +123,10 @@ def _separate(
             missing_warns,
         )
 
-    separated = DataFrame(separated.values.tolist()).iloc[:, colindex]
+    separated = DataFrame(separated, index=_data.index).iloc[:, colindex]
     separated.columns = non_na_elems(into)
     apply_dtypes(separated, convert)
 
-    _data = ungroup(data, **meta_pd)
     out = _data.drop(columns=[col]) if remove else _data
     out = mutate(out, separated, **meta_pd)
 
@@ -144,24 +155,30 @@ def _separate_rows(
     all_columns = data.columns
     selected = all_columns[list(vars_select(all_columns, *columns))]
     out = ungroup(data, **meta_pd)
-    for sel in selected:  # TODO: apply together
-        out[sel] = out[sel].apply(
-            _separate_col,
-            nout=0,
-            sep=sep,
-            extra="merge",
-            fill="right",
-            extra_warns=[],
-            missing_warns=[],
-        )
+    exploded = _explode_strs(out, selected, sep)
+    if exploded is not None:
+        apply_dtypes(exploded, convert)
+        out = exploded
+    else:
+        out = out.copy()
+        for sel in selected:
+            out[sel] = out[sel].apply(
+                _separate_col,
+                nout=0,
+                sep=sep,
+                extra="merge",
+                fill="right",
+                extra_warns=[],
+                missing_warns=[],
+            )
 
-    out = unchop(  # TODO: use df.x.explode()
-        out,
-        selected,
-        keep_empty=True,
-        dtypes=convert,
-        **meta_pd,
-    )
+        out = unchop(
+            out,
+            selected,
+            keep_empty=True,
+            dtypes=convert,
+            **meta_pd,
+        )
 
     return reconstruct_tibble(
         out,
@@ -170,6 +187,108 @@ def _separate_rows(
     )
 
 
+def _as_strs(x: Series) -> Optional[Series]:
+    """Turn the elements of a column into strings, keeping the NAs
+
+    Returns None if some elements are not scalars, which are separated
+    element by element.
+    """
+    if is_string_dtype(x) and not x.dtype == object:
+        return x
+
+    if x.dtype == object and not all(map(is_scalar, x)):
+        return None
+
+    return x.astype(str).astype(object).where(x.notna())
+
+
+def _explode_strs(
+    data: DataFrame,
+    columns: Index,
+    sep: str,
+) -> Optional[DataFrame]:
+    """Split the strings of the columns and explode them all together
+
+    Returns None when some columns cannot be split with the vectorized
+    string methods or the pieces of a row do not have the same length, which
+    are left to `unchop()`.
+    """
+    if data.shape[0] == 0:
+        return None
+
+    pieces = {}
+    sizes = None
+    for col in columns:
+        strs = _as_strs(data[col])
+        if strs is None:
+            return None
+
+        pieces[col] = strs.str.split(sep, regex=True).astype(object)
+        cursizes = pieces[col].str.len().fillna(1).to_numpy()
+        if sizes is not None and (sizes != cursizes).any():
+            return None
+        sizes = cursizes
+
+    out = data.assign(**pieces)
+    out = out.explode(list(columns), ignore_index=True)
+    out[columns] = out[columns].astype(object)
+    return out
+
+
+def _separate_strs(
+    strs: Series,
+    nout: int,
+    sep: Union[str, int],
+    extra: str,
+    fill: str,
+    extra_warns: List[str],
+    missing_warns: List[str],
+) -> np.ndarray:
+    """Separate the strings into `nout` pieces, like `_separate_col()` does
+    for each element, but with the vectorized string methods.
+
+    Returns:
+        An object array with a row for each string and a column for each
+        piece.
+    """
+    notna = strs.notna().to_numpy()
+    if isinstance(sep, int):
+        pieces = DataFrame(
+            {0: strs.str.slice(stop=sep), 1: strs.str.slice(start=sep)}
+        )
+    elif nout == 1:
+        # re.split() with maxsplit 0 splits all
+        pieces = strs.str.split(sep, regex=True, expand=True).iloc[:, :1]
+    else:
+        pieces = strs.str.split(sep, n=nout - 1, regex=True, expand=True)
+
+    width = max(nout, pieces.shape[1])
+    pieces = pieces.reindex(columns=range(width)).to_numpy(dtype=object, copy=True)
+    pieces[pd.isnull(pieces)] = np.nan
+    npieces = np.where(notna, (~pd.isnull(pieces)).sum(axis=1), nout)
+
+    missing = npieces < nout
+    if missing.any():
+        if fill == "warn":
+            missing_warns.extend(strs[missing])
+        if fill == "left":
+            for size in np.unique(npieces[missing]):
+                rows = npieces == size
+                pieces[rows] = np.roll(pieces[rows], nout - size, axis=1)
+
+    if not isinstance(sep, int) and nout > 1:
+        last = Series(pieces[:, nout - 1], dtype=object)
+        more_splits = last[npieces == nout].str.split(sep, n=1, regex=True)
+        more = more_splits.str.len() > 1
+        if more.any():
+            if extra == "warn":
+                extra_warns.extend(strs[more[more].index])
+            if extra in ("warn", "drop"):
+                pieces[more[more].index, nout - 1] = more_splits[more].str[0]
+
+    return pieces
+
+
 def _separate_col(
     elem: Any,
     nout: int,
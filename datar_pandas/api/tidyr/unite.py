@@ -4,11 +4,10 @@ from typing import Any, Union, cast
 
 from datar.apis.tidyr import unite
 
-from ... import pandas as pd
 from ...pandas import DataFrame, Series
 from ...common import setdiff
 from ...contexts import Context
-from ...utils import vars_select, meta_kwargs
+from ...utils import as_strs, vars_select, meta_kwargs
 from ...tibble import reconstruct_tibble
 from ..dplyr.group_by import ungroup
 
@@ -49,14 +48,24 @@ def _unite(
 
     out = ungroup(data, **meta_pd).copy()
 
-    united = Series(out[selected_columns].values.tolist(), index=out.index)
-    if sep is not None:
-        if na_rm:
-            united = united.transform(
-                lambda lst: [elem for elem in lst if pd.notnull(elem)]
-            )
+    if sep is None:
+        united = Series(out[selected_columns].values.tolist(), index=out.index)
+    else:
+        united = None
+        for column in selected_columns:
+            strs = as_strs(out[column], keep_na=na_rm)
+            if united is None:
+                united = strs
+                continue
+
+            joined = united.str.cat(strs, sep=sep)
+            if na_rm:
+                joined = joined.fillna(united).fillna(strs)
+            united = joined
 
-        united = united.transform(lambda x: sep.join(str(elem) for elem in x))
+        if united is None:
+            united = Series("", index=out.index)
+        united = Series(united.fillna("").tolist(), index=out.index)
 
     # get indexes to relocate
     insert_at = int(min(unite_idx))
@@ -25,6 +25,17 @@ from pandas.api.types import (  # noqa: F401
     union_categoricals,
     CategoricalDtype,
 )
+from pandas.api.extensions import take  # noqa: F401
+from pandas.arrays import SparseArray  # noqa: F401
+from pandas import SparseDtype  # noqa: F401
+
+try:
+    # to build sparse arrays from the positions of their values,
+    # without the dense arrays
+    from pandas._libs.sparse import IntIndex  # noqa: F401
+except ImportError:  # pragma: no cover
+    IntIndex = None
+from pandas.util import hash_pandas_object  # noqa: F401
 
 if get_option("use_modin"):  # pragma: no cover
     from modin.pandas import (  # noqa: F401
@@ -42,10 +53,12 @@ if get_option("use_modin"):  # pragma: no cover
         crosstab,
         concat,
         cut,
+        factorize,
         qcut,
         isna,
         isnull,
         merge,
+        merge_asof,
         notnull,
         pivot_table,
         read_csv,
@@ -81,10 +94,12 @@ else:
         crosstab,
         concat,
         cut,
+        factorize,
         qcut,
         isna,
         isnull,
         merge,
+        merge_asof,
         notnull,
         pivot_table,
         read_csv,
@@ -92,6 +92,9 @@ def dplyr_api():
         summarise,
         tidyselect,
     )
+    from .api.dplyr.join import asof_join
+
+    return {"asof_join": asof_join}
 
 
 @plugin.impl
@@ -140,6 +143,8 @@ def misc_api():
         pd_cat,
         pd_dt,
         pd_str,
+        pd_rolling,
+        pd_expanding,
         flatten,
     )
 
@@ -149,6 +154,8 @@ def misc_api():
         "pd_cat": pd_cat,
         "pd_dt": pd_dt,
         "pd_str": pd_str,
+        "pd_rolling": pd_rolling,
+        "pd_expanding": pd_expanding,
         "flatten": flatten,
     }
 
@@ -170,3 +170,68 @@ def get_grouper(grouped):
     if PANDAS_VERSION < (2, 2):  # pragma: no cover
         return grouped.grouper
     return grouped._grouper
+
+
+def split_offsets(codes: np.ndarray, ngroups: int):
+    """Put the rows of each group together by the group codes
+
+    This is how the rows of list-columns are held: the values in the order
+    and the offsets of the groups in them, so that the rows of group `i`
+    are `order[offsets[i]:offsets[i + 1]]`. Rows with code -1 are dropped.
+
+    Args:
+        codes: The group codes of the rows
+        ngroups: The number of groups
+
+    Returns:
+        The order of the rows and the offsets of the groups
+    """
+    codes = np.asarray(codes)
+    order = np.argsort(codes, kind="stable")
+    counts = np.bincount(codes[codes >= 0], minlength=ngroups)
+    offsets = np.zeros(ngroups + 1, dtype=np.intp)
+    np.cumsum(counts, out=offsets[1:])
+    return order[order.size - offsets[-1] :], offsets
+
+
+def group_codes(grouped, result_index) -> np.ndarray:
+    """Get the group codes of the rows of a grouped object against the
+    groups of another grouping
+
+    Args:
+        grouped: The grouped object
+        result_index: The groups to code the rows against
+
+    Returns:
+        The codes of the rows, -1 for the rows not in any of the groups
+    """
+    grouper = get_grouper(grouped)
+    codes = result_index.get_indexer(grouper.result_index)
+    # code -1 of the rows takes the -1 appended
+    return np.append(codes, -1)[grouper.codes_info]
+
+
+def as_strs(x: Series, keep_na: bool = False) -> Series:
+    """Turn the elements of a series into strings like `str()` does
+
+    Args:
+        x: The series
+        keep_na: Whether to keep the missing values as NAs
+
+    Returns:
+        An object series of the strings
+    """
+    if x.dtype != object and (
+        pd.is_numeric_dtype(x) or pd.is_string_dtype(x)
+    ):
+        strs = x.astype(str).astype(object, copy=True)
+    else:
+        strs = x.map(str).astype(object)
+
+    isna = x.isna()
+    if keep_na:
+        return strs.where(~isna)
+
+    # astype(str) may keep NAs
+    strs[isna] = x[isna].map(str).astype(object)
+    return strs
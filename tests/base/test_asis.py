@@ -236,6 +236,18 @@ def test_is_element():
     assert_iterable_equal(out.index, df.index)
 
 
+def test_is_element_interleaved_groups():
+    x = Series([1, 2, 3, 4, 5]).groupby([2, 1, 2, 1, 2])
+    y = Series([5, 2, 1, 4, 9]).groupby([2, 1, 2, 1, 2])
+    out = is_element(x, y)
+    assert_iterable_equal(out.index, [1, 1, 2, 2, 2])
+    assert_iterable_equal(out, [True, True, True, False, True])
+
+    out = is_element([2, 5], y)
+    assert_iterable_equal(out.index, [1, 1, 2, 2])
+    assert_iterable_equal(out, [True, False, False, True])
+
+
 def test_is_finite():
     assert_iterable_equal(is_finite(Series([1, 2, 3])), [True, True, True])
     assert_iterable_equal(
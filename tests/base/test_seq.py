@@ -18,7 +18,7 @@ from datar.base import (
     seq_along,
     seq,
 )
-from datar.dplyr import rowwise, mutate
+from datar.dplyr import group_by, rowwise, mutate
 from datar.tibble import tibble
 from datar_pandas.utils import get_grouper
 from datar_pandas.pandas import Series, assert_frame_equal, get_obj
@@ -96,6 +96,20 @@ def test_match():
     assert_iterable_equal(get_obj(out), [0, 1, 1, 1])
 
 
+def test_match_first_position_in_interleaved_groups():
+    df = tibble(x=[1, 2, 1, 4, 3], y=[2, 1, 3, 3, 1], g=[1, 2, 1, 2, 1])
+    out = match(df.y, df.x)
+    assert_iterable_equal(out, [1, 0, 4, 4, 0])
+
+    out = df >> group_by(f.g) >> mutate(m=match(f.x, f.y))
+    assert_iterable_equal(get_obj(out.m), [2, -1, 2, -1, 1])
+
+    gf = df.groupby("g")
+    out = match(gf.x, gf.y)
+    assert_iterable_equal(get_obj(out), [2, -1, 2, -1, 1])
+    assert_iterable_equal(get_obj(out).index, [0, 1, 2, 3, 4])
+
+
 def test_order():
     x = Series([5, 2, 3, 4])
     out = order(x)
@@ -171,6 +185,34 @@ def test_c():
     assert_iterable_equal(get_obj(out.z), [1.0, 1.5, 2.5, 3.0])
 
 
+def test_rep_c_interleaved_groups():
+    x = Series([1, 2, 3, 4]).groupby([2, 1, 2, 1])
+    out = rep(x, times=2)
+    assert_iterable_equal(get_obj(out), [2, 4, 2, 4, 1, 3, 1, 3])
+    assert_iterable_equal(get_grouper(out).size(), [4, 4])
+
+    times = Series([2, 1, 0, 0]).groupby([2, 1, 2, 1])
+    out = rep(x, times=times)
+    assert_iterable_equal(get_obj(out), [2, 1, 1])
+    assert_iterable_equal(get_grouper(out).size(), [1, 2])
+
+    # times of the elements in each group
+    out = rep(x, times=[1, 2])
+    assert_iterable_equal(get_obj(out), [2, 4, 4, 1, 3, 3])
+    assert_iterable_equal(get_grouper(out).size(), [3, 3])
+
+    with pytest.raises(ValueError, match="expect length 2"):
+        rep(x, times=[1, 2, 3])
+    with pytest.raises(ValueError, match="Unexpected each"):
+        rep(x, times=times, each=2)
+    with pytest.raises(ValueError, match="Unexpected each"):
+        rep(x, times=[1, 2], each=2)
+
+    out = c(x, 0)
+    assert_iterable_equal(get_obj(out), [2, 4, 0, 1, 3, 0])
+    assert_iterable_equal(get_grouper(out).size(), [3, 3])
+
+
 def test_rev():
     x = Series([1, 2, 3])
     out = rev(x)
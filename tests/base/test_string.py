@@ -125,6 +125,15 @@ def test_paste():
     assert_iterable_equal(out, ["14", "25|35"])
 
 
+def test_paste_columns_of_different_types():
+    df = tibble(x=[1, 2], y=[1.5, np.nan], z=["a", None])
+    out = paste(df, sep="-")
+    assert_iterable_equal(out, ["1-1.5-a", "2"])
+
+    out = paste0(df.group_by("x"), collapse="|")
+    assert_iterable_equal(out, ["11.5a", "2"])
+
+
 def test_sprintf():
     df = tibble(x=["%d", "%.2f"], y=[1.1, 2.345]).group_by("x")
     assert_iterable_equal(sprintf(df.x, df.y).obj, ["1", "2.35"])
@@ -112,6 +112,16 @@ def test_max_col():
     assert_iterable_equal(max_col(df, "last"), [3, 3, 3])
 
 
+def test_max_col_with_nas():
+    df = tibble(a=[1, NA, 3, NA], b=[1, 2, NA, NA], c=[0, 2, 3, NA])
+    assert_iterable_equal(max_col(df, "first"), [0, 1, 0, NA])
+    assert_iterable_equal(max_col(df, "last"), [1, 2, 2, NA])
+    out = max_col(df, "random")
+    assert out[0] in [0, 1]
+    assert out[1] in [1, 2]
+    assert out[2] in [0, 2]
+
+
 def test_complete_cases():
     df = tibble(
         a=[NA, 1, 2],
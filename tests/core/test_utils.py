@@ -3,7 +3,7 @@ import pytest
 import numpy as np
 from datar.base import is_integer
 from datar.tibble import tibble
-from datar_pandas.utils import apply_dtypes, dict_get
+from datar_pandas.utils import apply_dtypes, dict_get, split_offsets
 from ..conftest import assert_
 
 
@@ -21,3 +21,9 @@ def test_dict_get():
     assert dict_get(d, "c", None) is None
     with pytest.raises(KeyError):
         dict_get(d, "c")
+
+
+def test_split_offsets():
+    order, offsets = split_offsets(np.array([1, 0, -1, 1, 0, 3]), 4)
+    assert order.tolist() == [1, 4, 0, 3, 5]
+    assert offsets.tolist() == [0, 2, 4, 4, 5]
@@ -283,6 +283,19 @@ def test_nth_errors():
         nth(range(1, 11), "x")
 
 
+def test_nth_grouped_with_order_by():
+    x = Series([1, 2, 3, 4, 5]).groupby([2, 1, 2, 1, 2])
+    order_by = Series([3, 1, 1, 2, 2]).groupby([2, 1, 2, 1, 2])
+    out = nth(x, 1, order_by=order_by)
+    assert_iterable_equal(out.index, [1, 2])
+    assert_iterable_equal(out, [4, 5])
+
+    assert_iterable_equal(first(x, order_by=order_by), [2, 3])
+    assert_iterable_equal(last(x), [4, 5])
+    assert_iterable_equal(nth(x, 2, default=0), [0, 5])
+    assert_iterable_equal(nth(x, -3), [NA, 1])
+
+
 def test_first_uses_default_value_for_0len_input():
     # we are not distinguish NAs
     assert_iterable_equal([first([])], [NA])
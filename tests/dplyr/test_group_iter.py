@@ -316,6 +316,16 @@ def test_group_split_keeps_group_variables_by_default():
     assert res[1].equals(tbl.iloc[[2, 3], :].reset_index(drop=True))
 
 
+def test_group_split_with_missing_keys():
+    tbl = tibble(x=[1, 2, 3, 4], g=[2, None, 2, 1])
+    res = group_split.list(tbl, f.g)
+
+    assert len(res) == 3
+    assert res[0].x.tolist() == [1, 3]
+    assert res[1].x.tolist() == [2]
+    assert res[2].x.tolist() == [4]
+
+
 def test_group_split_can_discard_grouping_vars_by__keep_eqs_false():
     tbl = tibble(x=[1, 2, 3, 4], g=factor(rep(["a", "b"], each=2)))
     res = group_split.list(tbl, f.g, _keep=False)
@@ -16,6 +16,7 @@ from datar.dplyr import (
     pull,
     case_match,
     group_vars,
+    rowwise,
 )
 from datar.data import mtcars
 from datar.tibble import tibble
@@ -118,6 +119,33 @@ def test_inside_mutate():
     assert out == [2, 2, 1, 0]
 
 
+def test_values_keep_dtypes():
+    x = np.array([1, 2, 3])
+    out = case_when(x <= 1, [1], True, 2)
+    assert out.dtype == np.int64
+    assert_iterable_equal(out, [1, 2, 2])
+
+    c = Series(pandas.Categorical(["a", "b", "a"], categories=["b", "a"]))
+    out = case_when(Series(x) > 1, c)
+    assert out.dtype == c.dtype
+    assert_iterable_equal(out, [NA, "b", "a"])
+
+
+def test_series_aligned_by_index():
+    out = case_when(
+        Series([True, False], index=[1, 0]), Series([1, 2]), True, 0
+    )
+    assert_iterable_equal(out.index, [1, 0])
+    assert_iterable_equal(out, [2, 0])
+
+
+def test_rowwise_kept():
+    df = tibble(x=[1, 2, 3]) >> rowwise()
+    out = df >> mutate(y=case_when(f.x < 2, f.x, True, 0))
+    assert out.y.is_rowwise
+    assert_iterable_equal(out.y.obj, [1, 0, 0])
+
+
 def test_errors():
     x = np.array([NA] * 10)
     with pytest.raises(ValueError):
@@ -140,6 +168,11 @@ def test_case_match_lhs_can_match_na():
     assert_iterable_equal(case_match(NA, NA, "x"), ["x"])
 
 
+def test_case_match_na_only_matches_na():
+    x = np.array([1, NA, 3])
+    assert_iterable_equal(case_match(x, 1, 10, NA, 20), [10, 20, NA])
+
+
 def test_case_match_rhs_recycling():
     x = np.array([1, 2, 3])
     assert_iterable_equal(case_match(x, [1, 3], x * 2), [2, NA, 6])
@@ -168,3 +201,10 @@ def test_case_match_on_grouped():
     out = gdf >> mutate(y=case_match(f.x, 1, 2))
     assert_iterable_equal(group_vars(out), ["g"])
     assert_iterable_equal(out["y"].obj, [2, NA])
+
+
+def test_case_match_grouped_values():
+    gdf = tibble(g=[1, 2, 1], x=[1, 2, 3], y=[4, 5, 6]) >> group_by(f.g)
+    out = gdf >> mutate(z=case_match(f.x, [1, 2], f.y, _default=0))
+    assert_iterable_equal(group_vars(out), ["g"])
+    assert_iterable_equal(out["z"].obj, [4, 5, 0])
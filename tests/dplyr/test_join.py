@@ -100,6 +100,31 @@ def test_keys_are_coerced_to_symmetric_type():
     assert out.y.dtype.name == "category"
 
 
+def test_join_factor_keys_on_codes():
+    df1 = tibble(x=factor(["a", "b", None, "a"]), y=[1, 2, 3, 4])
+    df2 = tibble(x=factor(["c", "a", None], levels=["c", "a"]), z=[5, 6, 7])
+
+    out = left_join(df1, df2, by="x")
+    assert_iterable_equal(out.x.cat.categories, ["a", "b", "c"])
+    assert_iterable_equal(out.x, ["a", "b", None, "a"])
+    assert_iterable_equal(out.z, [6, None, 7, 6])
+    # inputs untouched
+    assert df1.x.dtype.name == "category"
+    assert df2.x.dtype.name == "category"
+
+    # keys sorted by values, missing last
+    out = full_join(df1, df2, by="x")
+    assert_iterable_equal(out.x, ["a", "a", "b", "c", None])
+    assert_iterable_equal(out.z, [6, 6, None, 5, 7])
+
+    # same categories, keys sorted by codes, missing first
+    df4 = tibble(x=factor(["b", None], levels=["b", "a"]), w=[1, 2])
+    df5 = tibble(x=factor(["a", "b"], levels=["b", "a"]), v=[3, 4])
+    out = full_join(df4, df5, by="x")
+    assert_iterable_equal(out.x, [None, "b", "a"])
+    assert_iterable_equal(out.v, [None, 4, 3])
+
+
 def test_when_keep_eqs_true_left_join_preserves_both_sets_of_keys():
     # test_that("when keep = True, left_join() preserves both sets of keys", {
 
@@ -361,3 +386,55 @@ def test_cross_join_suffix():
         cross_join(df1, df2, suffix=["", "_y"]).columns,
         ["x", "y", "x_y", "z"],
     )
+
+
+def test_join_sorted_keys():
+    df1 = tibble(a=[1, 2, 2, 4], b=list("wxyz"))
+    df2 = tibble(a=[2, 3, 4], c=[1.0, 2.0, 3.0], b=list("pqr"))
+
+    out = left_join(df1, df2, by="a")
+    assert_iterable_equal(out.columns, ["a", "b_x", "c", "b_y"])
+    assert_iterable_equal(out.a, [1, 2, 2, 4])
+    assert_iterable_equal(out.c, [None, 1.0, 1.0, 3.0])
+
+    out = full_join(df1, df2, by="a")
+    assert_iterable_equal(out.a, [1, 2, 2, 3, 4])
+    assert_iterable_equal(out.b_x, ["w", "x", "y", None, "z"])
+
+    out = inner_join(df1 >> group_by(f.b), df2, by="a", suffix=("", "_y"))
+    assert isinstance(out, TibbleGrouped)
+    assert group_vars(out) == ["b"]
+    assert_iterable_equal(out.a.obj, [2, 2, 4])
+
+
+# asof_join ---------------------------------------------------------------
+def test_asof_join():
+    from datar.dplyr import asof_join
+
+    trades = tibble(t=[5, 1, 10], g=["a", "b", "a"])
+    quotes = tibble(t=[0, 4, 9, 2], g=["a", "a", "a", "b"], q=[1, 2, 3, 4])
+
+    out = asof_join(trades, quotes, on=f.t)
+    assert_iterable_equal(out.columns, ["t", "g_x", "g_y", "q"])
+    assert_iterable_equal(out.t, [5, 1, 10])
+    assert_iterable_equal(out.q, [2, 1, 3])
+
+    out = asof_join(trades, quotes, on="t", by=f.g)
+    assert_iterable_equal(out.q, [2, None, 3])
+
+    out = asof_join(trades, quotes, on="t", by="g", direction="forward")
+    assert_iterable_equal(out.q, [3, 4, None])
+
+    out = asof_join(trades, quotes, on="t", by="g", tolerance=0)
+    assert_iterable_equal(out.q, [None, None, None])
+
+    quotes2 = quotes.rename(columns={"t": "time", "g": "grp"})
+    out = asof_join(trades, quotes2, on={"t": "time"}, by={"g": "grp"})
+    assert_iterable_equal(out.time, [4, None, 9])
+
+    out = trades >> group_by(f.g) >> asof_join(quotes, on="t", by="g")
+    assert isinstance(out, TibbleGrouped)
+    assert group_vars(out) == ["g"]
+
+    with pytest.raises(ValueError):
+        asof_join(trades, quotes, on=["t", "g"])
@@ -2,7 +2,10 @@
 # https://github.com/tidyverse/dplyr/blob/master/tests/testthat/test-lead-lag.R
 import pytest
 from datar.base import c, factor, levels, letters, NA, seq
-from datar.dplyr import lead, lag
+from datar import f
+from datar.dplyr import lead, lag, group_by, mutate
+from datar.tibble import tibble
+from datar_pandas.pandas import get_obj
 from ..conftest import assert_iterable_equal
 
 
@@ -152,3 +155,13 @@ def test_order_by():
 
     out = lag(x, order_by=seq(10, 1))
     assert_iterable_equal(out, c(seq(2, 10), NA))
+
+
+def test_order_by_grouped():
+    df = tibble(g=[1, 2, 1, 2, 1], x=[1, 2, 3, 4, 5], o=[3, 1, 2, 2, 1])
+    out = df >> group_by(f.g) >> mutate(
+        lag=lag(f.x, order_by=f.o),
+        lead=lead(f.x, default=0, order_by=f.o),
+    )
+    assert_iterable_equal(get_obj(out.lag), [3, NA, 5, 2, NA])
+    assert_iterable_equal(get_obj(out.lead), [0, 4, 1, 0, 3])
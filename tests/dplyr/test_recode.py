@@ -149,6 +149,9 @@ def test_can_recode_factor_to_double():
     assert_iterable_equal(recode(fct, a=1, b=2), c(1, 2, NA))
     assert_iterable_equal(recode(fct, a=1, b=2, _default=99), c(1, 2, 99))
 
+    fct = factor(["b", "a", "b", NA, "c"])
+    assert_iterable_equal(recode(fct, a=1, b=2), c(2, 1, 2, NA, NA))
+
 
 def test_recode_factor_handles_missing_and_default_levels(caplog):
     x = c(1, 2, 3, NA)
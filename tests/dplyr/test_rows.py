@@ -2,8 +2,11 @@
 # https://github1s.com/tidyverse/dplyr/blob/master/tests/testthat/test-rows.R
 import pytest
 
+from datar import f
 from datar.all import (
     tibble,
+    group_by,
+    group_rows,
     seq,
     letters,
     NA,
@@ -16,6 +19,7 @@ from datar.all import (
     rows_upsert,
 )
 from datar_pandas.pandas import assert_frame_equal
+from datar_pandas.api.dplyr.rows import _rows_key_index
 
 
 @pytest.fixture
@@ -345,3 +349,64 @@ def test_rows_errors(data):
     # works
     # rows_delete(data, tibble(a = [2,3]))
     # rows_delete(data, tibble(a = [2,3], b = "b"))
+
+
+# in_place
+def test_rows_in_place(data):
+    x = data.copy()
+    out = rows_update(x, tibble(a=[2, 3], b="z"), by="a", in_place=True)
+    assert out is x
+    exp = tibble(a=seq(1, 3), b=c("a", "z", "z"), c=data.c)
+    assert_frame_equal(x, exp)
+
+    # the key index is reused
+    index = _rows_key_index(x, ["a"])
+    rows_patch(x, tibble(a=[3, 1], b="y", c=[9.5, 9.5]), by="a", in_place=True)
+    assert _rows_key_index(x, ["a"]) is index
+    exp = tibble(a=seq(1, 3), b=c("a", "z", "z"), c=data.c)
+    assert_frame_equal(x, exp)
+    x.loc[2, "b"] = NA
+    rows_patch(x, tibble(a=[3, 1], b="y"), by="a", in_place=True)
+    assert x.b.tolist() == ["a", "z", "y"]
+
+    # keys replaced, index rebuilt
+    x["a"] = [4, 5, 6]
+    assert _rows_key_index(x, ["a"]) is not index
+
+    with pytest.raises(ValueError, match="missing rows"):
+        rows_update(x, tibble(a=[1, 4], b="w"), by="a", in_place=True)
+    with pytest.raises(ValueError, match="must be unique"):
+        rows_update(x, tibble(a=[4, 4], b="w"), by="a", in_place=True)
+
+    out = rows_update(x, tibble(a=[1, 4], b="w"), unmatched="ignore", in_place=True)
+    assert x.b.tolist() == ["w", "z", "y"]
+
+    out = rows_upsert(x, tibble(a=[7, 5], b="v"), by="a", in_place=True)
+    assert x.b.tolist() == ["w", "v", "y"]
+    assert out.a.tolist() == [4, 5, 6, 7]
+    assert out.b.tolist() == ["w", "v", "y", "v"]
+    assert _rows_key_index(out, ["a"]).tolist() == [4, 5, 6, 7]
+
+    out = rows_delete(out, tibble(a=[5, 7]), by="a", in_place=True)
+    assert out.a.tolist() == [4, 6]
+    assert _rows_key_index(out, ["a"]).tolist() == [4, 6]
+    with pytest.raises(ValueError, match="delete missing"):
+        rows_delete(out, tibble(a=[5]), by="a", in_place=True)
+
+
+def test_rows_in_place_dup_keys():
+    x = tibble(a=[1, 2, 1, 3], b=[2, 3, 4, 5], c=letters[:4])
+    rows_update(x, tibble(a=[1, 3], b=[99, 88]), by=["a"], in_place=True)
+    assert x.b.tolist() == [99, 3, 99, 88]
+
+    out = rows_delete(x, tibble(a=[1, 1]), by="a", in_place=True)
+    assert out.a.tolist() == [2, 3]
+
+
+def test_rows_in_place_grouped():
+    x = group_by(tibble(g=[1, 1, 2], a=[1, 2, 3], v=[1, 1, 1]), f.g)
+    rows_update(x, tibble(a=[3], v=[10]), by="a", in_place=True)
+    assert x.v.obj.tolist() == [1, 1, 10]
+
+    rows_update(x, tibble(a=[3], g=[1]), by="a", in_place=True)
+    assert group_rows(x) == [[0, 1, 2]]
@@ -35,7 +35,7 @@ from datar.dplyr import (
     symdiff,
 )
 from datar.tibble import tibble
-from datar_pandas.pandas import assert_frame_equal, SeriesGroupBy
+from datar_pandas.pandas import assert_frame_equal, Series, SeriesGroupBy
 
 from ..conftest import assert_equal, assert_, assert_iterable_equal
 
@@ -154,6 +154,32 @@ def test_intersect_with_compatible_series_groupby():
     assert_iterable_equal(res.obj, [1, 4])
 
 
+def test_union_setdiff_with_series_groupby():
+    df1 = tibble(x=[1, 2, 3, 4, 3], g=[1, 1, 2, 2, 2])
+    df2 = tibble(x=[1, 10, 1, 4, 3, 13], g=[1, 1, 1, 2, 2, 2])
+    gdf1 = group_by(df1, f.g)
+    gdf2 = group_by(df2, f.g)
+
+    res = union(gdf1.x, gdf2.x)
+    assert isinstance(res, SeriesGroupBy)
+    assert_iterable_equal(res.obj.index, [1, 1, 1, 2, 2, 2])
+    assert_iterable_equal(res.obj, [1, 2, 10, 3, 4, 13])
+
+    res = union(gdf1.x, [4, 5])
+    assert_iterable_equal(res.obj, [1, 2, 4, 5, 3, 4, 5])
+
+    res = setdiff(gdf1.x, gdf2.x)
+    assert_iterable_equal(res.obj.index, [1, 2])
+    assert_iterable_equal(res.obj, [2, None])
+
+    res = setdiff([1, 3, 5], gdf1.x)
+    assert_iterable_equal(res.obj.index, [1, 1, 2, 2])
+    assert_iterable_equal(res.obj, [3, 5, 1, 5])
+
+    with pytest.raises(ValueError, match="not compatible for union"):
+        union(gdf1.x, group_by(df1, f.x).x)
+
+
 def test_set_operations_reconstruct_grouping_metadata():
     # test_that("set operations reconstruct grouping metadata (#3587)", {
     df1 = tibble(x=seq(1, 4), g=rep([1, 2], each=2)) >> group_by(f.g)
@@ -310,3 +336,39 @@ def test_intersect_union_setdiff_keep_y_groups():
     out = setdiff(x, y)
     assert out.group_vars == ["x"]
     assert out.shape[0] == 0
+
+
+def test_set_operations_by_row_hashes(monkeypatch):
+    from datar_pandas.api.dplyr import sets
+
+    df1 = tibble(x=[1.0, -0.0, None, 1.0], y=["a", "b", None, "a"])
+    df2 = tibble(y=["b", None, "c"], x=[0.0, None, 2.0])
+
+    def check():
+        out = intersect(df1, df2)
+        assert_iterable_equal(out.x, [0.0, None])
+        assert_iterable_equal(out.y, ["b", None])
+        assert_iterable_equal(out.index, [0, 1])
+
+        out = setdiff(df1, df2)
+        assert_iterable_equal(out.x, [1.0])
+
+        out = union(df1, df2)
+        assert_iterable_equal(out.x, [0.0, 1.0, 2.0, None])
+        assert_iterable_equal(out.y, ["b", "a", "c", None])
+
+        out = symdiff(df1, df2)
+        assert_iterable_equal(out.x, [1.0, 2.0])
+
+        assert setequal(df1, df1.iloc[[3, 2, 1, 0], :])
+        assert not setequal(df1, df1.iloc[[3, 2, 1, 1], :])
+
+    check()
+    # all rows collide, falling back to merge
+    monkeypatch.setattr(
+        sets,
+        "hash_pandas_object",
+        lambda df, index: Series(numpy.zeros(df.shape[0], dtype="uint64")),
+    )
+    assert sets._row_codes(df1, df2[df1.columns]) is None
+    check()
@@ -22,6 +22,12 @@ def test_all_inputs_must_be_factors():
         fct_c(1)
 
 
+def test_strings_are_taken_as_length_1_factors():
+    fct = fct_c("u", factor(c("a", "u")))
+    assert_iterable_equal(fct, c("u", "a", "u"))
+    assert_iterable_equal(levels(fct), c("u", "a"))
+
+
 def test_empty_input_yields_empty_factor():
     assert_factor_equal(fct_c(factor()), factor())
 
@@ -112,3 +118,31 @@ def test_can_combine_more_than_two_factors():
             )
         ),
     )
+
+
+def test_levels_follow_the_order_of_input_levels():
+    fruit = factor(c("kiwi", NA, "apple", "kiwi"), levels=c("kiwi", "apple"))
+    colour = factor(c("red", "red", "green", "green"))
+
+    f2 = fct_cross(fruit, colour)
+    assert_iterable_equal(levels(f2), c("kiwi:green", "kiwi:red", "apple:green"))
+    assert_iterable_equal(f2, c("kiwi:red", NA, "apple:green", "kiwi:green"))
+
+
+def test_fct_c_keeps_level_types():
+    fct = fct_c(factor(c(1, 2)), factor(c(3, 1)))
+
+    assert_iterable_equal(levels(fct), c(1, 2, 3))
+    assert_iterable_equal(fct, c(1, 2, 3, 1))
+
+
+def test_high_cardinality_factors_keep_observed_levels_only():
+    lvls = [str(i) for i in range(100_000)]
+    fs = [
+        factor(c(str(i), str(99_999 - i), str(i)), levels=lvls)
+        for i in range(4)
+    ]
+
+    f2 = fct_cross(*fs)
+    assert_iterable_equal(levels(f2), c("0:1:2:3", "99999:99998:99997:99996"))
+    assert_iterable_equal(f2, c("0:1:2:3", "99999:99998:99997:99996", "0:1:2:3"))
@@ -14,6 +14,7 @@ from datar.forcats import (
     fct_shift,
     fct_shuffle,
     first2,
+    last2,
 )
 from datar.tibble import tribble
 from datar_pandas.pandas import Series, get_obj
@@ -78,6 +79,19 @@ def test_can_reorder_by_2d_summary():
     assert_iterable_equal(levels(f2), c("a", "b"))
 
 
+def test_reorder_levels_not_in_order_of_appearance():
+    f1 = factor(c("b", "a", NA, "b", "c"), levels=c("a", "b", "c", "d"))
+
+    f2 = fct_reorder(f1, c(3, 1, 9, 2, 0))
+    assert_iterable_equal(levels(f2), c("c", "a", "b", "d"))
+
+    f2 = fct_reorder(f1, c(3, 1, 9, 2, 0), _fun=len)
+    assert_iterable_equal(levels(f2), c("a", "c", "b", "d"))
+
+    f3 = fct_reorder2(f1, c(1, 2, 3, 4, 5), c(3, 2, 9, 1, 5))
+    assert_iterable_equal(levels(f3), c("c", "a", "b", "d"))
+
+
 def test_can_reorder_by_2d_summary2():
     df = tribble(
         f.g,
@@ -168,6 +182,11 @@ def test_first2():
     assert out == 3
 
 
+def test_last2():
+    out = last2([4, 3, 1, NA], numpy.array([1, 2, 3, 4]))
+    assert out == 1
+
+
 def test_shuffle():
     f = factor(c("c", "a", "a", "b"))
     f2 = fct_shuffle(f)
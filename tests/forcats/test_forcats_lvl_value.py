@@ -270,6 +270,18 @@ def test_fct_lump_min_works_when_weighted():
     )
 
 
+def test_fct_lump_min_keeps_missing_values_and_order():
+    f = factor(c("d", "b", NA, "a", "d", "c", "d"), levels=letters[:12])
+    out = fct_lump_min(f, min=2)
+
+    assert_iterable_equal(out, c("d", "Other", NA, "Other", "d", "Other", "d"))
+    assert_iterable_equal(levels(out), c("d", "Other"))
+
+    out = fct_lump_min(f, min=2, w=c(1, 2, 5, 0, 1, 1, 1))
+    assert_iterable_equal(out, c("d", "b", NA, "Other", "d", "Other", "d"))
+    assert_iterable_equal(levels(out), c("b", "d", "Other"))
+
+
 def test_throws_error_if_n_or_prop_is_not_numeric():
     f = c("a", "a", "a", "a", "b", "b", "b", "c", "c", "d")
     with pytest.raises(TypeError):
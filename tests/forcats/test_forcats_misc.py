@@ -212,3 +212,7 @@ def test_lvls_union():
     b = factor(["b", "c"])
     c = factor(["c", "d"])
     assert_iterable_equal(lvls_union([a, b, c]), ["a", "b", "c", "d"])
+
+    out = lvls_union([factor([2, 1]), factor([3, 1])])
+    assert isinstance(out, numpy.ndarray)
+    assert_iterable_equal(out, [1, 2, 3])
@@ -2,11 +2,20 @@ import pytest  # noqa: F401
 
 import numpy as np
 from datar import f
-from datar.misc import itemgetter, attrgetter, pd_str, pd_cat, pd_dt, flatten
+from datar.misc import (
+    itemgetter,
+    attrgetter,
+    pd_str,
+    pd_cat,
+    pd_dt,
+    pd_rolling,
+    pd_expanding,
+    flatten,
+)
 from datar.tibble import tibble
-from datar.dplyr import mutate
+from datar.dplyr import mutate, group_by
 from datar_pandas.utils import get_grouper
-from datar_pandas.pandas import Series, Categorical, get_obj
+from datar_pandas.pandas import Series, Categorical, get_obj, to_datetime
 from datar_pandas.collections import Collection
 
 from .conftest import assert_iterable_equal
@@ -52,6 +61,29 @@ def test_itemgetter():
     assert_iterable_equal(out, [1, 3])
 
 
+def test_itemgetter_interleaved_groups():
+    x = Series([1, 2, 3, 4, 5]).groupby([2, 1, 2, 1, 2])
+    out = itemgetter(x, [-1])
+    assert_iterable_equal(out.index, [1, 2])
+    assert_iterable_equal(out, [4, 5])
+
+    subscr = Series([2, 0, 1, 1, 0]).groupby([2, 1, 2, 1, 2])
+    out = itemgetter(x, subscr)
+    assert_iterable_equal(out.index, [1, 1, 2, 2, 2])
+    assert_iterable_equal(out, [2, 4, 5, 3, 1])
+
+    with pytest.raises(IndexError):
+        itemgetter(x, [2])
+
+    with pytest.raises(IndexError, match="wrong length"):
+        itemgetter(x, [True, False])
+
+    x = Series([1, 2, 3, 4]).groupby([2, 1, 2, 1])
+    out = itemgetter(x, [False, True])
+    assert_iterable_equal(out.index, [1, 2])
+    assert_iterable_equal(out, [4, 3])
+
+
 def test_attrgetter():
     s = Series(["aa", "bb", "cc"]).groupby([1, 1, 2], group_keys=True)
     out = attrgetter(s, "str").upper()
@@ -126,3 +158,40 @@ def test_array_ufunc():
     assert_iterable_equal(gf.y.obj, [1, 2])
     assert_iterable_equal(gf.z.obj, [1, 4])
     assert_iterable_equal(gf.w.obj, [1, 4])
+
+
+def test_pd_rolling():
+    out = pd_rolling([1, 2, 3], 2, "sum")
+    assert_iterable_equal(out, [np.nan, 3, 5])
+
+    df = tibble(
+        g=[1, 2, 1, 2, 1, 1],
+        x=[1, 2, 3, 4, 5, 6],
+        t=to_datetime(
+            [
+                "2020-01-03",
+                "2020-01-01",
+                "2020-01-01",
+                "2020-01-02",
+                "2020-01-02",
+                "2020-01-09",
+            ]
+        ),
+    )
+    out = df >> group_by(f.g) >> mutate(
+        a=pd_rolling(f.x, 2),
+        b=pd_rolling(f.x, "2D", "sum", time=f.t),
+        c=pd_rolling(f.x, 2, np.ptp, min_periods=1),
+    )
+    assert_iterable_equal(get_obj(out.a), [np.nan, np.nan, 2, 3, 4, 5.5])
+    assert_iterable_equal(get_obj(out.b), [6, 2, 3, 6, 8, 6])
+    assert_iterable_equal(get_obj(out.c), [0, 0, 2, 2, 2, 1])
+
+
+def test_pd_expanding():
+    out = pd_expanding([1, 2, 3])
+    assert_iterable_equal(out, [1, 1.5, 2])
+
+    df = tibble(g=[1, 2, 1, 2, 1], x=[1, 2, 3, 4, 5])
+    out = df >> group_by(f.g) >> mutate(y=pd_expanding(f.x, "quantile", 0.5))
+    assert_iterable_equal(get_obj(out.y), [1, 2, 2, 3, 3])
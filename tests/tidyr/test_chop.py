@@ -7,7 +7,7 @@ from datar.tibble import tibble, drop_index
 from datar.tidyr import chop, unchop
 from datar.dplyr import group_by, group_vars, pull
 from datar_pandas.pandas import assert_frame_equal
-from ..conftest import assert_equal
+from ..conftest import assert_equal, assert_iterable_equal
 
 
 # chop --------------------------------------------------------------------
@@ -47,6 +47,13 @@ def test_chop_with_all_column_keys():
     assert_frame_equal(out, df)
 
 
+def test_chop_keeps_missing_keys_and_order():
+    df = tibble(x=[2, None, 2, 1], a=[1, 2, 3, 4])
+    out = chop(df, f.a)
+    assert_iterable_equal(out.x, [2, None, 1])
+    assert out.a.tolist() == [[1, 3], [2], [4]]
+
+
 # unchop ------------------------------------------------------------------
 
 
@@ -16,7 +16,7 @@ from datar.base import (
     seq,
 )
 from datar.tibble import tibble, tribble
-from datar.dplyr import pull, group_by, rowwise
+from datar.dplyr import pull, group_by, group_vars, rowwise
 from datar.tidyr import (
     expand,
     nesting,
@@ -101,6 +101,21 @@ def test_expand_respects_groups():
     )
 
 
+def test_expand_grouped_columns_at_once():
+    df = tibble(
+        g=[2, 1, 2, 2, 1],
+        x=[2, 1, 1, 2, 1],
+        y=["b", "a", NA, "a", "a"],
+    ) >> group_by(f.g)
+    out = expand(df, f.x, yy=f.y)
+    assert_equal(group_vars(out), ["g"])
+    assert_iterable_equal(get_obj(out.g), [2, 2, 2, 2, 2, 2, 1])
+    assert_iterable_equal(get_obj(out.x), [1, 1, 1, 2, 2, 2, 1])
+    assert_iterable_equal(
+        get_obj(out.yy), ["a", "b", NA, "a", "b", NA, "a"]
+    )
+
+
 def test_presevers_ordered_factors():
     df = tibble(a=factor("a", ordered=True))
     out = expand(df, f.a)
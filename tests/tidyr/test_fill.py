@@ -88,3 +88,18 @@ def test_fill_respects_grouping():
     df = tibble(x=c(1, 1, 2), y=c(1, NA, NA))
     out = df >> group_by(f.x) >> fill(f.y)
     assert_iterable_equal(get_obj(out.y), [1, 1, NA])
+
+
+def test_fill_grouped_columns_both_directions():
+    df = tibble(
+        g=c(1, 2, 1, 2, 1),
+        x=c(NA, 1, 2, NA, NA),
+        y=c("a", NA, NA, NA, "b"),
+    ) >> group_by(f.g)
+    out = df >> fill(f.x, f.y, _direction="downup")
+    assert_iterable_equal(get_obj(out.x), [2, 1, 2, 1, 2])
+    assert_iterable_equal(get_obj(out.y), ["a", NA, "a", NA, "b"])
+
+    out = df >> fill(f.x, f.y, _direction="updown")
+    assert_iterable_equal(get_obj(out.x), [2, 1, 2, 1, 2])
+    assert_iterable_equal(get_obj(out.y), ["a", NA, "b", NA, "b"])
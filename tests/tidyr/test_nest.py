@@ -225,6 +225,25 @@ def test_unnest_multiple_columns_must_be_same_length():
         unnest(df, c(f.x, f.y))
 
 
+def test_unnest_recycles_size_one_cells():
+    df = tibble(k=[1, 2], x=[[1], [2, 3]], y=[[4, 5], [6]])
+    out = unnest(df, c(f.x, f.y))
+    assert_iterable_equal(out.k, [1, 1, 2, 2])
+    assert_iterable_equal(out.x, [1, 1, 2, 3])
+    assert_iterable_equal(out.y, [4, 5, 6, 6])
+
+
+def test_unnest_keep_empty_with_empty_vectors():
+    df = tibble(k=[1, 2, 3], x=[[1, 2], [], NULL])
+    out = unnest(df, f.x)
+    assert_iterable_equal(out.k, [1, 1])
+    assert out.x.dtype == "int64"
+
+    out = unnest(df, f.x, keep_empty=True)
+    assert_iterable_equal(out.k, [1, 1, 2, 3])
+    assert_iterable_equal(out.x, [1, 2, NA, NA])
+
+
 def test_unnest_using_non_syntactic_names():
     out = tibble(foo_bar=[[1, 2], 3])
     out.columns = ["foo bar"]
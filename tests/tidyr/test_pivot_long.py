@@ -197,6 +197,20 @@ def test_dot_value_can_be_any_position_in_names_to():
     assert_frame_equal(value_first, value_second)
 
 
+def test_dot_value_keeps_row_order_and_fills_missing():
+    df = tibble(ID=c(2, 1), a_1=c(1, 2), b_1=c(3, 4), a_2=c(5, 6))
+    pv = pivot_longer(df, ~f.ID, names_to=c(".value", "n"), names_sep="_")
+
+    assert pv.columns.tolist() == ["ID", "n", "a", "b"]
+    assert_iterable_equal(pv.ID, [2, 2, 1, 1])
+    assert_iterable_equal(pv.n, ["1", "2", "1", "2"])
+    assert_iterable_equal(pv.a, [1, 5, 2, 6])
+    assert_iterable_equal(pv.b, [3, NA, 4, NA])
+
+    with pytest.raises(ValueError, match="duplicate"):
+        pivot_longer(df, ~f.ID, names_to=".value", names_pattern="(.)_.")
+
+
 def test_type_error_message_use_variable_names():
     df = tibble(abc=1, xyz="b")
     # no error, dtype falls back to object
@@ -246,6 +246,90 @@ def test_can_pivot_from_multiple_measure_cols_using_all_keys():
     assert_iterable_equal(sp.b_y, [4])
 
 
+def test_unique_keys_scattered_directly():
+    df = tibble(
+        id=c(2, 1, 1, NA, 3),
+        key=c("y", "x", "y", "x", NA),
+        val=c(1, NA, 3, 4, 5),
+    )
+    out = pivot_wider(df, names_from=f.key, values_from=f.val, values_fill=0)
+    # ids only seen with missing names are dropped, as well as missing ids
+    assert_iterable_equal(out.id, [1, 2])
+    assert out.columns.tolist() == ["id", "x", "y"]
+    # original NAs are kept, only missing cells filled
+    assert_iterable_equal(out.x, [NA, 0])
+    assert_iterable_equal(out.y, [3, 1])
+
+
+def test_sparse_output():
+    df = tibble(id=c(1, 2, 3), key=c("x", "y", "x"), val=c(1, 2, 3))
+    out = pivot_wider(df, names_from=f.key, values_from=f.val, _sparse=True)
+    assert out.columns.tolist() == ["id", "x", "y"]
+    assert out.x.dtype == "Sparse[float64, nan]"
+    assert_iterable_equal(out.x.sparse.to_dense(), [1, NA, 3])
+    assert_iterable_equal(out.y.sparse.to_dense(), [NA, 2, NA])
+    assert out.y.sparse.npoints == 1
+
+    out = pivot_wider(
+        df,
+        names_from=f.key,
+        values_from=f.val,
+        values_fill=0,
+        _sparse=True,
+    )
+    assert out.x.dtype == "Sparse[int64, 0]"
+    assert_iterable_equal(out.y.sparse.to_dense(), [0, 2, 0])
+
+    # aggregated
+    df = tibble(id=c(1, 1, 2), key=c("x", "x", "y"), val=c(1, 2, 3))
+    out = pivot_wider(
+        df,
+        names_from=f.key,
+        values_from=f.val,
+        values_fn=sum,
+        _sparse=True,
+    )
+    assert_iterable_equal(out.x.sparse.to_dense(), [3, NA])
+    assert_iterable_equal(out.y.sparse.to_dense(), [NA, 3])
+    assert out.x.sparse.npoints == 1
+
+    # not all values aggregated
+    df = tibble(id=c(1, 1, 2), key=c("x", "x", "y"), a=c(1, 2, 3), b=c(1, 2, 3))
+    out = pivot_wider(
+        df,
+        names_from=f.key,
+        values_from=c(f.a, f.b),
+        values_fn={"a": sum},
+        _sparse=True,
+    )
+    assert out.columns.tolist() == ["id", "a_x", "a_y"]
+    assert_iterable_equal(out.a_x.sparse.to_dense(), [3, NA])
+
+
+@pytest.mark.parametrize(
+    "val, fill",
+    [
+        (c(1.5, 2.0, 3.0), "z"),
+        (c(True, False, True), None),
+        (c(True, False, True), False),
+        (c(1, 2, 3), None),
+        (c("a", "b", "c"), None),
+    ],
+)
+def test_sparse_output_same_as_dense(val, fill):
+    df = tibble(id=c(1, 2, 3), key=c("x", "y", "x"), val=val)
+    dense = pivot_wider(
+        df, names_from=f.key, values_from=f.val, values_fill=fill
+    )
+    out = pivot_wider(
+        df, names_from=f.key, values_from=f.val, values_fill=fill, _sparse=True
+    )
+    for col in ("x", "y"):
+        values = out[col].sparse.to_dense()
+        assert_iterable_equal(values, dense[col])
+        assert [type(x) for x in values] == [type(x) for x in dense[col]]
+
+
 # test_that("column order in output matches spec", {
 #   df <- tribble(
 #     ~hw,   ~name,  ~mark,   ~pr,
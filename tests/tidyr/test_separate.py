@@ -164,6 +164,14 @@ def test_separate_on_group_vars():
     assert_equal(group_vars(out), ["x", "y"])
 
 
+def test_separate_grouped_data():
+    df = tibble(g=[2, 1, 2], x=["a_b", "c_d", "e"]) >> group_by(f.g)
+    out = separate(df, f.x, c("x", "y"), fill="right")
+    assert_iterable_equal(get_obj(out.x), ["a", "c", "e"])
+    assert_iterable_equal(get_obj(out.y), ["b", "d", NA])
+    assert_equal(group_vars(out), ["g"])
+
+
 # separate_rows --------------------------------
 
 
@@ -179,6 +187,14 @@ def test_can_handle_empty_dfs():
     assert_frame_equal(rs, df)
 
 
+def test_separate_rows_keeps_missing_values():
+    df = tibble(x=c[1:4], y=c("a,b", NA, "c"), z=c("1,2", "3", NA))
+    out = separate_rows(df, f.y, f.z)
+    assert_iterable_equal(out.x, [1, 1, 2, 3])
+    assert_iterable_equal(out.y, ["a", "b", NA, "c"])
+    assert_iterable_equal(out.z, ["1", "2", "3", NA])
+
+
 # test_that("default pattern does not split decimals in nested strings", {
 #   df <- dplyr::tibble(x = 1:3, y = c("1", "1.0,1.1", "2.1"))
 #   expect_equal(separate_rows(df, y)$y, unlist(strsplit(df$y, ",")))
@@ -53,6 +53,15 @@ def test_can_remove_missing_vars_on_request():
     assert_iterable_equal(out.z, c("a_b", "a", "b", ""))
 
 
+def test_unite_numbers_as_they_are():
+    df = tibble(x=[1, 2], y=[1.5, NA], z=[True, False])
+    out = df >> unite("u", f.x, f.y, f.z)
+    assert_iterable_equal(out.u, ["1_1.5_True", "2_False"])
+
+    out = df >> unite("u", f.x, f.y, na_rm=False)
+    assert_iterable_equal(out.u, ["1_1.5", "2_nan"])
+
+
 # test_that("regardless of the type of the NA", {
 #   vec_unite <- function(df, vars) {
 #     unite(df, "out", any_of(vars), na.rm = TRUE)$out